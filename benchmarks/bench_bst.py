@@ -0,0 +1,66 @@
+""" Throughput of the recursive and loop-based BinarySearchTree operations.
+
+Usage: python -m benchmarks.bench_bst [n ...]
+Defaults to 10^4, 10^5 and 10^6 keys.
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+from random_gen import RandomGen
+from data_structures.bst import BinarySearchTree
+
+
+def time_ops(label: str, n: int, func) -> None:
+    """ Run func once and print the throughput in operations per second. """
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print('{0:>10} {1:>8} keys: {2:8.3f}s ({3:,.0f} ops/s)'.format(label, n, elapsed, n / elapsed))
+
+
+def bench(n: int) -> None:
+    RandomGen.set_seed(n)
+    keys = list(range(n))
+    RandomGen.random_shuffle(keys)
+
+    recursive = BinarySearchTree()
+    iterative = BinarySearchTree()
+
+    def insert_recursive():
+        for key in keys:
+            recursive.root = recursive.insert_aux(recursive.root, key, key)
+
+    def insert_iterative():
+        for key in keys:
+            iterative.insert_iter(key, key)
+
+    def get_recursive():
+        for key in keys:
+            recursive.get_tree_node_by_key_aux(recursive.root, key)
+
+    def get_iterative():
+        for key in keys:
+            iterative.get_tree_node_by_key_iter(key)
+
+    def delete_recursive():
+        for key in keys:
+            recursive.root = recursive.delete_aux(recursive.root, key)
+
+    def delete_iterative():
+        for key in keys:
+            iterative.delete_iter(key)
+
+    time_ops('insert rec', n, insert_recursive)
+    time_ops('insert it', n, insert_iterative)
+    time_ops('get rec', n, get_recursive)
+    time_ops('get it', n, get_iterative)
+    RandomGen.random_shuffle(keys)
+    time_ops('delete rec', n, delete_recursive)
+    time_ops('delete it', n, delete_iterative)
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    for size in sizes:
+        bench(size)
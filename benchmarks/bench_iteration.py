@@ -0,0 +1,32 @@
+""" Full in-order traversal with the stack-based and Morris iterators.
+
+Usage: python -m benchmarks.bench_iteration [n ...]
+Defaults to a 10^6 node tree.
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import time
+from data_structures.avl import AVLTree
+from data_structures.bst import BSTInOrderIterator, BSTMorrisIterator
+
+
+def time_traversal(label: str, n: int, iterator) -> None:
+    """ Walk the whole iterator and print the time per node. """
+    start = time.perf_counter()
+    for _ in iterator:
+        pass
+    elapsed = time.perf_counter() - start
+    print('{0:>8} {1:>8} nodes: {2:8.3f}s ({3:6.1f} ns/node)'.format(label, n, elapsed, elapsed / n * 1e9))
+
+
+def bench(n: int) -> None:
+    tree = AVLTree.from_items([(key, key) for key in range(n)], presorted=True)
+    time_traversal('stack', n, BSTInOrderIterator(tree.root))
+    time_traversal('morris', n, BSTMorrisIterator(tree.root))
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**6]
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,38 @@
+""" Memory used per island by Island objects and a Mode1Navigator built from them.
+
+Usage: python -m benchmarks.bench_memory [n ...]
+Defaults to 10^4, 10^5 and 10^6 islands generated with Island.random().
+"""
+__docformat__ = 'reStructuredText'
+
+import sys
+import tracemalloc
+from random_gen import RandomGen
+from island import Island
+from mode1 import Mode1Navigator
+
+
+def random_islands(n: int) -> list[Island]:
+    """ n random islands, duplicate marines / money ratios included. """
+    return [Island.random() for _ in range(n)]
+
+
+def bench(n: int) -> None:
+    RandomGen.set_seed(n)
+
+    tracemalloc.start()
+    islands = random_islands(n)
+    islands_bytes = tracemalloc.get_traced_memory()[0]
+    navigator = Mode1Navigator(islands, 0)
+    total_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print('{0:>8} islands: {1:6.1f} bytes/island for islands, {2:6.1f} bytes/island for the navigator'.format(
+        n, islands_bytes / n, (total_bytes - islands_bytes) / n))
+    del navigator
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10**4, 10**5, 10**6]
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,271 @@
+""" Array-backed Binary Search Tree.
+    Defines a Binary Search Tree whose nodes live in parallel columns
+    (key, item, left index, right index) instead of TreeNode objects.
+    Deleted nodes go on a free list and their slots are reused by later inserts.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import sys
+from array import array
+from typing import Generic, Iterator
+from data_structures.bst import K, I
+from data_structures.referential_array import ArrayR
+
+
+class ArrayBinarySearchTree(Generic[K, I]):
+    """
+    Binary search tree stored in parallel arrays.
+
+    Node i has key keys[i], item items[i] and children lefts[i] and rights[i],
+    where NIL marks a missing child. Free slots are chained through lefts,
+    starting at self.free. The columns double when every slot is in use.
+
+    It supports the same mapping operations as BinarySearchTree (in, [], [] = and del).
+    As there are no TreeNode objects, iterating yields keys in order rather than nodes;
+    use items_in_order for (key, item) pairs, or slots_in_order for the slots themselves.
+    """
+
+    NIL = -1
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int = 1) -> None:
+        """
+            Initialises an empty tree with room for capacity nodes
+            :complexity: O(capacity)
+        """
+        capacity = max(self.MIN_CAPACITY, capacity)
+        self.keys = ArrayR(capacity)
+        self.items = ArrayR(capacity)
+        self.lefts = array('q', [self.NIL]) * capacity
+        self.rights = array('q', [self.NIL]) * capacity
+        self.root = self.NIL
+        self.length = 0
+        # Slots [used, capacity) have never been handed out
+        self.used = 0
+        self.free = self.NIL
+
+    def __len__(self) -> int:
+        """ Returns the number of nodes in the tree. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.root == self.NIL
+
+    @property
+    def capacity(self) -> int:
+        """ Returns the number of slots currently allocated. """
+        return len(self.keys)
+
+    def grow(self) -> None:
+        """
+            Double the number of slots, copying the used ones across
+            :complexity: O(capacity)
+        """
+        old_capacity = self.capacity
+        keys = ArrayR(2 * old_capacity)
+        items = ArrayR(2 * old_capacity)
+        for i in range(old_capacity):
+            keys[i] = self.keys[i]
+            items[i] = self.items[i]
+        self.keys = keys
+        self.items = items
+        self.lefts.extend(array('q', [self.NIL]) * old_capacity)
+        self.rights.extend(array('q', [self.NIL]) * old_capacity)
+
+    def allocate(self, key: K, item: I) -> int:
+        """
+            Take a slot from the free list (or a fresh one) and fill it as a leaf
+            :complexity: amortised O(1)
+        """
+        if self.free != self.NIL:
+            slot = self.free
+            self.free = self.lefts[slot]
+        else:
+            if self.used == self.capacity:
+                self.grow()
+            slot = self.used
+            self.used += 1
+        self.keys[slot] = key
+        self.items[slot] = item
+        self.lefts[slot] = self.NIL
+        self.rights[slot] = self.NIL
+        return slot
+
+    def release(self, slot: int) -> None:
+        """
+            Put a slot on the free list
+            :complexity: O(1)
+        """
+        self.keys[slot] = None
+        self.items[slot] = None
+        self.rights[slot] = self.NIL
+        self.lefts[slot] = self.free
+        self.free = slot
+
+    def find(self, key: K) -> int:
+        """
+            Returns the slot holding key
+            :complexity best: O(CompK) key is at the root
+            :complexity worst: O(CompK * D) key is not found, where D is the depth of the tree
+            :raises KeyError: if the key is not in the tree
+        """
+        current = self.root
+        while current != self.NIL:
+            current_key = self.keys[current]
+            if key == current_key:
+                return current
+            elif key < current_key:
+                current = self.lefts[current]
+            else:
+                current = self.rights[current]
+        raise KeyError('Key not found: {0}'.format(key))
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see find
+        """
+        try:
+            self.find(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Get the item stored under key
+            :complexity: see find
+            :raises KeyError: if the key is not in the tree
+        """
+        return self.items[self.find(key)]
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Insert an item under a new key
+            :complexity best: O(CompK) inserts the item at the root.
+            :complexity worst: O(CompK * D) inserting at the bottom of the tree
+            where D is the depth of the tree
+            :raises ValueError: if the key is already in the tree
+        """
+        parent = self.NIL
+        current = self.root
+        while current != self.NIL:
+            current_key = self.keys[current]
+            if key < current_key:
+                parent, current = current, self.lefts[current]
+            elif key > current_key:
+                parent, current = current, self.rights[current]
+            else:  # key == current_key
+                raise ValueError('Inserting duplicate item')
+
+        slot = self.allocate(key, item)
+        if parent == self.NIL:
+            self.root = slot
+        elif key < self.keys[parent]:
+            self.lefts[parent] = slot
+        else:
+            self.rights[parent] = slot
+        self.length += 1
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Delete the node holding key, returning its slot to the free list.
+            A node with two children takes the key and item of its successor,
+            and the successor's slot is released instead.
+            :complexity: O(CompK * D) where D is the depth of the tree
+            :raises ValueError: if the key is not in the tree
+        """
+        parent = self.NIL
+        current = self.root
+        while current != self.NIL and key != self.keys[current]:
+            parent = current
+            current = self.lefts[current] if key < self.keys[current] else self.rights[current]
+
+        if current == self.NIL:  # key not found
+            raise ValueError('Deleting non-existent item')
+
+        if self.lefts[current] != self.NIL and self.rights[current] != self.NIL:
+            # general case => find a successor and remove that slot instead
+            parent = current
+            succ = self.rights[current]
+            while self.lefts[succ] != self.NIL:
+                parent, succ = succ, self.lefts[succ]
+            self.keys[current] = self.keys[succ]
+            self.items[current] = self.items[succ]
+            current = succ
+
+        child = self.lefts[current] if self.lefts[current] != self.NIL else self.rights[current]
+        if parent == self.NIL:
+            self.root = child
+        elif self.lefts[parent] == current:
+            self.lefts[parent] = child
+        else:
+            self.rights[parent] = child
+        self.release(current)
+        self.length -= 1
+
+    def slots_in_order(self) -> Iterator[int]:
+        """
+            Yields the slots of the tree in key order, using a list of slots as the stack
+            :complexity: O(N) for the whole traversal
+        """
+        stack = []
+        current = self.root
+        while True:
+            while current != self.NIL:
+                stack.append(current)
+                current = self.lefts[current]
+            if not stack:
+                return
+            current = stack.pop()
+            yield current
+            current = self.rights[current]
+
+    def __iter__(self) -> Iterator[K]:
+        """
+            Iterate over the keys in order.
+            Unlike BinarySearchTree, which yields TreeNodes, keys are yielded as there are no nodes.
+        """
+        for slot in self.slots_in_order():
+            yield self.keys[slot]
+
+    def items_in_order(self) -> Iterator[tuple[K, I]]:
+        """ Iterate over the (key, item) pairs in key order. """
+        for slot in self.slots_in_order():
+            yield self.keys[slot], self.items[slot]
+
+    def draw(self, to=sys.stdout):
+        """ Draw the tree in the terminal, as BinarySearchTree.draw does. """
+        self.draw_aux(self.root, prefix='', final='', to=to)
+
+    def draw_aux(self, current: int, prefix='', final='', to=sys.stdout) -> None:
+        """ Draw a slot's key and then its children. """
+        real_prefix = prefix[:-2] + final
+        if current != self.NIL:
+            print('{0}{1}'.format(real_prefix, str(self.keys[current])), file=to)
+
+            if self.lefts[current] != self.NIL or self.rights[current] != self.NIL:
+                self.draw_aux(self.lefts[current], prefix=prefix + '\u2551 ', final='\u255f\u2500', to=to)
+                self.draw_aux(self.rights[current], prefix=prefix + '  ', final='\u2559\u2500', to=to)
+        else:
+            print('{0}'.format(real_prefix), file=to)
+
+    def __str__(self) -> str:
+        """ Return a string representation of the tree, as BinarySearchTree.__str__ does. """
+        return self.str_aux(self.root)
+
+    def str_aux(self, current: int) -> str:
+        """ Return a string representation of the sub-tree at slot current. """
+        if current == self.NIL:
+            return '    |    '
+        return self.str_aux(self.lefts[current]) + \
+               str(self.keys[current]) + \
+               self.str_aux(self.rights[current])
@@ -0,0 +1,211 @@
+""" AVL Tree.
+    Defines a self-balancing Binary Search Tree built from AVLTreeNodes.
+    Each node stores its height so the balance factor can be checked after
+    every insertion and deletion.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic
+from data_structures.bst import BinarySearchTree, K, I
+from data_structures.node import AVLTreeNode
+
+
+class AVLTree(BinarySearchTree, Generic[K, I]):
+    """ Self-balancing binary search tree using the AVL algorithm. """
+
+    def __init__(self) -> None:
+        """
+            Initialises an empty AVL Tree
+            :complexity: O(1)
+        """
+        BinarySearchTree.__init__(self)
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Insert using the recursive insert_aux so every node on the path is
+            rebalanced. The recursion depth is bounded by the tree height,
+            which is O(log(N)).
+        """
+        self.root = self.insert_aux(self.root, key, item)
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Delete using the recursive delete_aux so every node on the path is
+            rebalanced. The recursion depth is bounded by the tree height,
+            which is O(log(N)).
+        """
+        self.root = self.delete_aux(self.root, key)
+
+    def create_node(self, key: K, item: I) -> AVLTreeNode:
+        """
+            Create an AVLTreeNode of height 1.
+            :complexity: O(1)
+        """
+        return AVLTreeNode(key, item)
+
+    def build_balanced_aux(self, pairs: list[tuple[K, I]], lo: int, hi: int) -> AVLTreeNode:
+        """
+            Build a balanced sub-tree as in BinarySearchTree, then set the height of
+            its root from the (already built) children.
+            :complexity: O(hi - lo)
+        """
+        current = BinarySearchTree.build_balanced_aux(self, pairs, lo, hi)
+        if current is not None:
+            self.update_height(current)
+        return current
+
+    def get_height(self, current: AVLTreeNode) -> int:
+        """
+            Get the height of a node. Return current.height if current is
+            not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+        if current is not None:
+            return current.height
+        return 0
+
+    def get_balance(self, current: AVLTreeNode) -> int:
+        """
+            Compute the balance factor for the current sub-tree as the value
+            (right.height - left.height). If current is None, return 0.
+            :complexity: O(1)
+        """
+        if current is None:
+            return 0
+        return self.get_height(current.right) - self.get_height(current.left)
+
+    def update_height(self, current: AVLTreeNode) -> None:
+        """
+            Recompute the height of current from the heights of its children.
+            :complexity: O(1)
+        """
+        current.height = 1 + max(self.get_height(current.left), self.get_height(current.right))
+
+    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+        """
+            Attempts to insert an item into the tree, it uses the Key to insert it
+            and rebalances every node on the way back up.
+            :complexity best: O(CompK * log(N)) inserting at the bottom of the tree
+            :complexity worst: O(CompK * log(N)) the height is bounded by 1.44 * log(N)
+            where N is the number of nodes in the tree
+            CompK is the complexity of comparing the keys
+        """
+        if current is None:  # base case: at the leaf
+            current = self.create_node(key, item)
+            self.length += 1
+            return current
+        elif key < current.key:
+            current.left = self.insert_aux(current.left, key, item)
+        elif key > current.key:
+            current.right = self.insert_aux(current.right, key, item)
+        else:  # key == current.key
+            raise ValueError('Inserting duplicate item')
+        return self.rebalance(current)
+
+    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
+        """
+            Attempts to delete an item from the tree, it uses the Key to
+            determine the node to delete, and rebalances every node on the
+            way back up.
+            :complexity: O(CompK * log(N)) where N is the number of nodes in the tree
+        """
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+        elif key < current.key:
+            current.left = self.delete_aux(current.left, key)
+        elif key > current.key:
+            current.right = self.delete_aux(current.right, key)
+        else:  # we found our key => do actual deletion
+            if self.is_leaf(current):
+                self.length -= 1
+                return None
+            elif current.left is None:
+                self.length -= 1
+                return current.right
+            elif current.right is None:
+                self.length -= 1
+                return current.left
+
+            # general case => find a successor
+            succ = self.get_successor(current)
+            current.key = succ.key
+            current.item = succ.item
+            current.right = self.delete_aux(current.right, succ.key)
+
+        return self.rebalance(current)
+
+    def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform left rotation of the sub-tree.
+            Right child of the current node, i.e. of the root of the target
+            sub-tree, should become the new root of the sub-tree.
+            returns the new root of the subtree.
+            Example:
+
+                 current                                       child
+                /       \\                                      /   \\
+            l-tree     child           -------->        current   r-tree
+                      /     \\                           /     \\
+                 center     r-tree                 l-tree     center
+
+            :complexity: O(1)
+        """
+        child = current.right
+        current.right = child.left
+        child.left = current
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform right rotation of the sub-tree.
+            Left child of the current node, i.e. of the root of the target
+            sub-tree, should become the new root of the sub-tree.
+            returns the new root of the subtree.
+            Example:
+
+                       current                                child
+                      /       \\                              /     \\
+                  child       r-tree     --------->     l-tree     current
+                 /     \\                                           /     \\
+            l-tree     center                                 center     r-tree
+
+            :complexity: O(1)
+        """
+        child = current.left
+        current.left = child.right
+        child.right = current
+        self.update_height(current)
+        self.update_height(child)
+        return child
+
+    def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Compute the balance of the current node.
+            Do rebalancing of the sub-tree of this node if necessary.
+            Rebalancing should be done either by:
+            - one left rotate
+            - one right rotate
+            - a combination of left + right rotate
+            - a combination of right + left rotate
+            returns the new root of the subtree.
+            :complexity: O(1)
+        """
+        self.update_height(current)
+        balance = self.get_balance(current)
+
+        if balance >= 2:
+            if self.get_balance(current.right) < 0:
+                current.right = self.right_rotate(current.right)
+            return self.left_rotate(current)
+
+        if balance <= -2:
+            if self.get_balance(current.left) > 0:
+                current.left = self.left_rotate(current.left)
+            return self.right_rotate(current)
+
+        return current
@@ -8,9 +8,10 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 from data_structures.linked_stack import LinkedStack
 from data_structures.node import TreeNode
+from algorithms.mergesort import mergesort
 import sys
 
 
@@ -85,6 +86,89 @@ class BSTInOrderIterator:
         return result
 
 
+class BSTMorrisIterator:
+    """ In-order iterator for the binary search tree.
+        Performs Morris traversal: instead of a stack, the empty right pointer of
+        each node's in-order predecessor is temporarily threaded back to the node,
+        so no memory is allocated per step and only O(1) extra memory is used.
+
+        The tree is modified while the traversal runs. Iterate to the end, or call
+        close() (or use the iterator in a with statement) before the tree is used
+        or changed again.
+    """
+
+    def __init__(self, root: TreeNode[K, I]) -> None:
+        """ Iterator initialiser. """
+
+        self.root = root
+        self.current = root
+
+    def __iter__(self) -> BSTMorrisIterator:
+        """ Standard __iter__() method for initialisers. Returns itself. """
+
+        return self
+
+    def __enter__(self) -> BSTMorrisIterator:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __next__(self) -> TreeNode[K, I]:
+        """ The main body of the iterator.
+            Returns nodes of the BST one by one respecting the in-order.
+            :complexity: amortised O(1), every edge is walked at most three times overall
+        """
+
+        current = self.current
+        while current is not None:
+            if current.left is None:
+                self.current = current.right
+                return current
+
+            # find the in-order predecessor, stopping at an existing thread
+            pred = current.left
+            while pred.right is not None and pred.right is not current:
+                pred = pred.right
+
+            if pred.right is None:
+                # first visit: thread the predecessor back and go left
+                pred.right = current
+                current = current.left
+            else:
+                # second visit: the left sub-tree is done, remove the thread
+                pred.right = None
+                self.current = current.right
+                return current
+
+        self.current = None
+        raise StopIteration
+
+    def close(self) -> None:
+        """ Remove the threads left by an unfinished traversal.
+            A thread can only be left on the predecessor of the next node, or of an
+            ancestor whose left sub-tree holds the next node. These are the nodes
+            where a search for the next node's key goes left, plus the next node itself.
+            :complexity: O(D^2) where D is the depth of the tree
+        """
+
+        target = self.current
+        self.current = None
+        if target is None:
+            return
+        node = self.root
+        while node is not None:
+            if node is target or target.key < node.key:
+                pred = node.left
+                while pred is not None and pred.right is not None and pred.right is not node:
+                    pred = pred.right
+                if pred is not None and pred.right is node:
+                    pred.right = None
+            if node is target:
+                return
+            node = node.left if target.key < node.key else node.right
+
+
 class BSTPostOrderIterator:
     """ Post-order iterator for the binary search tree.
         Performs stack-based BST traversal.
@@ -132,6 +216,63 @@ class BinarySearchTree(Generic[K, I]):
         self.root = None
         self.length = 0
 
+    @classmethod
+    def from_items(cls, pairs: list[tuple[K, I]], presorted: bool = False) -> BinarySearchTree[K, I]:
+        """
+            Bulk-load a tree from (key, item) pairs.
+            The pairs are sorted once by key with mergesort (skipped when presorted
+            is True), then a perfectly balanced tree is built by recursive midpoint
+            selection.
+            :complexity: O(N * CompK) when presorted, O(N * log(N) * CompK) otherwise,
+            where N is the number of pairs
+            :raises ValueError: if two pairs share a key, or presorted pairs are out of order
+        """
+        tree = cls()
+        tree.bulk_load(pairs, presorted)
+        return tree
+
+    def bulk_load(self, pairs: list[tuple[K, I]], presorted: bool = False) -> None:
+        """
+            Replace the contents of the tree with the (key, item) pairs, as from_items does.
+            For trees whose constructor takes arguments.
+            :complexity: O(N * CompK) when presorted, O(N * log(N) * CompK) otherwise,
+            where N is the number of pairs
+            :raises ValueError: if two pairs share a key, or presorted pairs are out of order
+        """
+        pairs = list(pairs)
+        if not presorted:
+            pairs = mergesort(pairs, key=lambda pair: pair[0])
+        for i in range(1, len(pairs)):
+            if not pairs[i - 1][0] < pairs[i][0]:
+                if pairs[i - 1][0] == pairs[i][0]:
+                    raise ValueError('Inserting duplicate item')
+                raise ValueError('Pairs are not sorted by key')
+
+        self.root = self.build_balanced_aux(pairs, 0, len(pairs))
+        self.length = len(pairs)
+
+    def build_balanced_aux(self, pairs: list[tuple[K, I]], lo: int, hi: int) -> TreeNode:
+        """
+            Build a balanced sub-tree from the sorted pairs[lo:hi], using the
+            middle pair as the root. Returns the root of the sub-tree.
+            :complexity: O(hi - lo)
+        """
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, item = pairs[mid]
+        current = self.create_node(key, item)
+        current.left = self.build_balanced_aux(pairs, lo, mid)
+        current.right = self.build_balanced_aux(pairs, mid + 1, hi)
+        return current
+
+    def create_node(self, key: K, item: I) -> TreeNode:
+        """
+            Create a node for this tree. Subclasses override this to use their own node type.
+            :complexity: O(1)
+        """
+        return TreeNode(key, item)
+
     def is_empty(self) -> bool:
         """
             Checks to see if the bst is empty
@@ -169,8 +310,76 @@ class BinarySearchTree(Generic[K, I]):
         """
         return self.get_tree_node_by_key(key).item
 
+    def iter_from(self, key: K) -> BSTInOrderIterator:
+        """
+            Create an in-order iterator that starts at the smallest key >= key.
+            The stack is seeded with the nodes on the search path where the search
+            went left, so successors are then streamed lazily.
+            :complexity: O(CompK * D) to seek, where D is the depth of the tree
+        """
+        iterator = BSTInOrderIterator(None)
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                iterator.stack.push(current)
+                current = current.left
+            else:
+                current = current.right
+        return iterator
+
+    def range(self, lo: K, hi: K) -> Iterator[TreeNode]:
+        """
+            Iterate in order over the nodes with lo <= key < hi.
+            :complexity: O(CompK * (D + R)) where D is the depth of the tree
+            and R is the number of nodes returned
+        """
+        for node in self.iter_from(lo):
+            if not node.key < hi:
+                return
+            yield node
+
+    def floor(self, key: K) -> TreeNode:
+        """
+            Get the node with the largest key <= key.
+            :complexity: O(CompK * D) where D is the depth of the tree
+            :raises KeyError: if every key in the tree is larger
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:
+                best = current
+                current = current.right
+        if best is None:
+            raise KeyError('No key at or below: {0}'.format(key))
+        return best
+
+    def ceiling(self, key: K) -> TreeNode:
+        """
+            Get the node with the smallest key >= key.
+            :complexity: O(CompK * D) where D is the depth of the tree
+            :raises KeyError: if every key in the tree is smaller
+        """
+        best = None
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key > current.key:
+                current = current.right
+            else:
+                best = current
+                current = current.left
+        if best is None:
+            raise KeyError('No key at or above: {0}'.format(key))
+        return best
+
     def get_tree_node_by_key(self, key: K) -> TreeNode:
-        return self.get_tree_node_by_key_aux(self.root, key)
+        return self.get_tree_node_by_key_iter(key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
         if current is None:  # base case: empty
@@ -182,8 +391,25 @@ class BinarySearchTree(Generic[K, I]):
         else:  # key > current.key
             return self.get_tree_node_by_key_aux(current.right, key)
 
+    def get_tree_node_by_key_iter(self, key: K) -> TreeNode:
+        """
+            Loop-based version of get_tree_node_by_key_aux.
+            Walks a cursor down from the root so no Python frame is used per level.
+            :complexity best: O(CompK) finds the item in the root of the tree
+            :complexity worst: O(CompK * D) item is not found, where D is the depth of the tree
+        """
+        current = self.root
+        while current is not None:
+            if key == current.key:
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
+
     def __setitem__(self, key: K, item: I) -> None:
-        self.root = self.insert_aux(self.root, key, item)
+        self.insert_iter(key, item)
 
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
@@ -194,7 +420,7 @@ class BinarySearchTree(Generic[K, I]):
             CompK is the complexity of comparing the keys
         """
         if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
+            current = self.create_node(key, item)
             self.length += 1
         elif key < current.key:
             current.left = self.insert_aux(current.left, key, item)
@@ -204,8 +430,38 @@ class BinarySearchTree(Generic[K, I]):
             raise ValueError('Inserting duplicate item')
         return current
 
+    def insert_iter(self, key: K, item: I) -> TreeNode:
+        """
+            Loop-based version of insert_aux.
+            Walks a cursor down to the leaf position, remembering the parent,
+            and links the new node there. Returns the new node.
+            :complexity best: O(CompK) inserts the item at the root.
+            :complexity worst: O(CompK * D) inserting at the bottom of the tree
+            where D is the depth of the tree
+            :raises ValueError: if the key is already in the tree
+        """
+        parent = None
+        current = self.root
+        while current is not None:
+            if key < current.key:
+                parent, current = current, current.left
+            elif key > current.key:
+                parent, current = current, current.right
+            else:  # key == current.key
+                raise ValueError('Inserting duplicate item')
+
+        new_node = self.create_node(key, item)
+        if parent is None:
+            self.root = new_node
+        elif key < parent.key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self.length += 1
+        return new_node
+
     def __delitem__(self, key: K) -> None:
-        self.root = self.delete_aux(self.root, key)
+        self.delete_iter(key)
 
     def delete_aux(self, current: TreeNode, key: K) -> TreeNode:
         """
@@ -238,6 +494,43 @@ class BinarySearchTree(Generic[K, I]):
 
         return current
 
+    def delete_iter(self, key: K) -> None:
+        """
+            Loop-based version of delete_aux.
+            Finds the node and its parent with a cursor. A node with two
+            children takes the key and item of its successor, and the
+            successor (which has no left child) is spliced out instead.
+            :complexity: O(CompK * D) where D is the depth of the tree
+            :raises ValueError: if the key is not in the tree
+        """
+        parent = None
+        current = self.root
+        while current is not None and key != current.key:
+            parent = current
+            current = current.left if key < current.key else current.right
+
+        if current is None:  # key not found
+            raise ValueError('Deleting non-existent item')
+
+        if current.left is not None and current.right is not None:
+            # general case => find a successor and remove that node instead
+            parent = current
+            succ = current.right
+            while succ.left is not None:
+                parent, succ = succ, succ.left
+            current.key = succ.key
+            current.item = succ.item
+            current = succ
+
+        child = current.left if current.left is not None else current.right
+        if parent is None:
+            self.root = child
+        elif parent.left is current:
+            parent.left = child
+        else:
+            parent.right = child
+        self.length -= 1
+
     def get_successor(self, current: TreeNode) -> TreeNode:
         """
             Get successor of the current node.
@@ -247,7 +540,7 @@ class BinarySearchTree(Generic[K, I]):
         """
         if current is None:
             return None
-        return self.get_minimal(current.right)
+        return self.get_minimal_iter(current.right)
 
     def get_minimal(self, current: TreeNode) -> TreeNode:
         """
@@ -259,6 +552,17 @@ class BinarySearchTree(Generic[K, I]):
             return current
         return self.get_minimal(current.left)
 
+    def get_minimal_iter(self, current: TreeNode) -> TreeNode:
+        """
+            Loop-based version of get_minimal.
+            :complexity: O(D) where D is the depth of the sub-tree
+        """
+        if current is None:
+            return None
+        while current.left is not None:
+            current = current.left
+        return current
+
     def is_leaf(self, current: TreeNode) -> bool:
         """ Simple check whether or not the node is a leaf. """
 
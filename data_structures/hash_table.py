@@ -7,8 +7,8 @@ __author__ = 'Jackson Goerner'
 __since__ = '07/02/2023'
 
 
+from array import array
 from typing import TypeVar, Generic
-from data_structures.referential_array import ArrayR
 
 K = TypeVar('K')
 V = TypeVar('V')
@@ -26,6 +26,28 @@ class LinearProbeTable(Generic[K, V]):
                 Otherwise `hash` should be overwritten.
         - V:    Value Type.
 
+    Entries are stored densely, in insertion order, in the entry_keys, entry_values
+    and entry_hashes lists. The probed table itself is `slots`, an array of indices
+    into those lists (EMPTY for a free slot), so moving an entry between slots only
+    moves an integer. A deleted entry leaves a HOLE in the dense lists, and the lists
+    are compacted once there are more holes than entries. Iterating over the entries
+    is O(len(self)) rather than O(table_size).
+    The table grows when it is more than max_load full, and shrinks when it falls
+    below SHRINK_LOAD of that.
+
+    With cache_hashes=True, each key is hashed once to a full width (64 bit) value
+    by `full_hash`, which is stored in entry_hashes.
+    The full hash is reduced to a slot by multiply-shift (the table sizes are primes,
+    so a mask cannot be used), compared before the key when probing, and reused
+    when entries are moved by `__delitem__` and `_rehash`.
+    Any hashable key can then be used.
+
+    With robin_hood=True (which also caches hashes), an insert that meets an entry
+    closer to its home than the new entry is to its own takes that slot, and carries
+    on inserting the displaced entry. Probe lengths then stay short and even, a
+    lookup can stop as soon as it passes an entry closer to home than it is, and the
+    table only grows once it is ROBIN_HOOD_MAX_LOAD full instead of half full.
+
     Unless stated otherwise, all methods have O(1) complexity.
     """
 
@@ -34,16 +56,76 @@ class LinearProbeTable(Generic[K, V]):
 
     HASH_BASE = 31
 
-    def __init__(self, sizes=None) -> None:
+    HASH_BITS = 64
+    HASH_MASK = (1 << HASH_BITS) - 1
+    # Odd 64 bit constant (2^64 / golden ratio) spreading the low bits of a hash into the high bits
+    HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+    # Fraction of the table that may be used before it is resized
+    MAX_LOAD = 0.5
+    ROBIN_HOOD_MAX_LOAD = 0.85
+    # The table shrinks once it is less than this fraction of max_load full
+    SHRINK_LOAD = 0.25
+
+    # A free slot in slots, and a deleted entry in entry_keys
+    EMPTY = -1
+    HOLE = object()
+
+    def __init__(self, sizes=None, cache_hashes: bool = False, robin_hood: bool = False) -> None:
         """
         Initialise the Hash Table.
         """
         if sizes is not None:
             self.TABLE_SIZES = sizes
+        self.robin_hood = robin_hood
+        self.cache_hashes = cache_hashes or robin_hood
+        self.max_load = self.ROBIN_HOOD_MAX_LOAD if robin_hood else self.MAX_LOAD
         self.size_index = 0
-        self.array:ArrayR[tuple[K, V]] = ArrayR(self.TABLE_SIZES[self.size_index])
+        self.slots = array('q', [self.EMPTY]) * self.TABLE_SIZES[self.size_index]
+        self.entry_keys: list[K] = []
+        self.entry_values: list[V] = []
+        self.entry_hashes: list[int] = []
         self.count = 0
 
+    @classmethod
+    def from_items(cls, pairs, sizes=None, cache_hashes: bool = False, robin_hood: bool = False) -> LinearProbeTable[K, V]:
+        """
+        Build a table from (key, value) pairs, sized for all of them up front.
+        Later pairs overwrite earlier ones with the same key.
+
+        :complexity: O(N*hash(K)) with no rehashing (plus probing), where N is len(pairs).
+        """
+        table = cls(sizes, cache_hashes=cache_hashes, robin_hood=robin_hood)
+        table.update(pairs)
+        return table
+
+    def update(self, pairs) -> None:
+        """
+        Set every (key, value) pair, resizing at most once, before any are inserted.
+        The new size assumes all the keys are new, so no insert triggers a rehash.
+
+        :complexity: O(N*hash(K)) (plus probing, and one O(len(self)) resize),
+                     where N is len(pairs).
+        """
+        pairs = list(pairs)
+        size_index = self.size_index_for(len(self) + len(pairs))
+        if size_index > self.size_index:
+            self._resize(size_index)
+        for key, value in pairs:
+            self[key] = value
+
+    def size_index_for(self, count: int) -> int:
+        """
+        The index of the smallest table size that holds count entries without a rehash
+        (or of the largest size, if none does).
+
+        :complexity: O(len(TABLE_SIZES))
+        """
+        for size_index, size in enumerate(self.TABLE_SIZES):
+            if count <= size * self.max_load:
+                return size_index
+        return len(self.TABLE_SIZES) - 1
+
     def hash(self, key: K) -> int:
         """
         Hash a key for insert/retrieve/update into the hashtable.
@@ -58,9 +140,25 @@ class LinearProbeTable(Generic[K, V]):
             a = a * self.HASH_BASE % (self.table_size - 1)
         return value
 
+    def full_hash(self, key: K) -> int:
+        """
+        Hash a key to a full width value, used when hashes are cached.
+        Python's built-in hash is computed in C (and cached by strings),
+        then multiplied so that small integers also differ in their high bits.
+
+        :complexity: O(len(key)) the first time a string is hashed, O(1) after.
+        """
+        return (hash(key) * self.HASH_MULTIPLIER) & self.HASH_MASK
+
+    def slot(self, full_hash: int) -> int:
+        """
+        Reduce a full width hash to a position in the table by multiply-shift.
+        """
+        return (full_hash * self.table_size) >> self.HASH_BITS
+
     @property
     def table_size(self) -> int:
-        return len(self.array)
+        return len(self.slots)
 
     def __len__(self) -> int:
         """
@@ -68,26 +166,50 @@ class LinearProbeTable(Generic[K, V]):
         """
         return self.count
 
-    def _linear_probe(self, key: K, is_insert: bool) -> int:
+    def home(self, index: int) -> int:
         """
-        Find the correct position for this key in the hash table using linear probing.
+        The position the key of the entry at index hashes to, before any probing.
+
+        :complexity: O(1) when hashes are cached, O(hash(key)) otherwise.
+        """
+        if self.cache_hashes:
+            return self.slot(self.entry_hashes[index])
+        return self.hash(self.entry_keys[index])
+
+    def distance(self, position: int) -> int:
+        """
+        How far the entry in the slot at position is from its home, when hashes are cached.
+        """
+        return (position - self.slot(self.entry_hashes[self.slots[position]])) % self.table_size
+
+    def _linear_probe(self, key: K, is_insert: bool, full_hash: int = None) -> int:
+        """
+        Find the correct slot for this key in the hash table using linear probing.
+        When hashes are cached, full_hash is the key's full hash if already known.
         :complexity best: O(hash(key)) first position is empty
         :complexity worst: O(hash(key) + N*comp(K)) when we've searched the entire table
                         where N is the tablesize
         :raises KeyError: When the key is not in the table, but is_insert is False.
         :raises FullError: When a table is full and cannot be inserted.
         """
+        if self.robin_hood:
+            # Robin Hood inserts move other entries, so they go through _robin_hood_insert
+            return self._robin_hood_probe(key, self.full_hash(key) if full_hash is None else full_hash)
+        if self.cache_hashes:
+            return self._cached_probe(key, is_insert, self.full_hash(key) if full_hash is None else full_hash)
+
         # Initial position
         position = self.hash(key)
 
         for _ in range(self.table_size):
-            if self.array[position] is None:
+            index = self.slots[position]
+            if index == self.EMPTY:
                 # Empty spot. Am I upserting or retrieving?
                 if is_insert:
                     return position
                 else:
                     raise KeyError(key)
-            elif self.array[position][0] == key:
+            elif self.entry_keys[index] == key:
                 return position
             else:
                 # Taken by something else. Time to linear probe.
@@ -98,28 +220,116 @@ class LinearProbeTable(Generic[K, V]):
         else:
             raise KeyError(key)
 
+    def _cached_probe(self, key: K, is_insert: bool, full_hash: int) -> int:
+        """
+        Linear probing from the slot of full_hash, for tables caching their hashes.
+        Keys are only compared when their cached hashes are equal.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N*comp(K)) when we've searched the entire table
+                        where N is the tablesize
+        :raises KeyError: When the key is not in the table, but is_insert is False.
+        :raises FullError: When a table is full and cannot be inserted.
+        """
+        position = self.slot(full_hash)
+
+        for _ in range(self.table_size):
+            index = self.slots[position]
+            if index == self.EMPTY:
+                if is_insert:
+                    return position
+                raise KeyError(key)
+            elif self.entry_hashes[index] == full_hash and self.entry_keys[index] == key:
+                return position
+            position = (position + 1) % self.table_size
+
+        if is_insert:
+            raise FullError("Table is full!")
+        else:
+            raise KeyError(key)
+
+    def _robin_hood_probe(self, key: K, full_hash: int) -> int:
+        """
+        Find the slot of key in a Robin Hood table.
+        The search stops at the first entry closer to its home than the key would be.
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(D*comp(K)) where D is the longest probe distance in the table
+        :raises KeyError: When the key is not in the table.
+        """
+        position = self.slot(full_hash)
+
+        for distance in range(self.table_size):
+            index = self.slots[position]
+            if index == self.EMPTY or self.distance(position) < distance:
+                break
+            elif self.entry_hashes[index] == full_hash and self.entry_keys[index] == key:
+                return position
+            position = (position + 1) % self.table_size
+
+        raise KeyError(key)
+
+    def _robin_hood_insert(self, index: int) -> None:
+        """
+        Place the entry at index, whose key is not in the table, in a Robin Hood table.
+        :pre: the table is not full
+        :complexity best: O(1) first position is empty
+        :complexity worst: O(N) where N is the tablesize
+        """
+        position = self.slot(self.entry_hashes[index])
+        distance = 0
+
+        while self.slots[position] != self.EMPTY:
+            current_distance = self.distance(position)
+            if current_distance < distance:
+                # Take the slot from the entry closer to home, and carry on with it
+                self.slots[position], index = index, self.slots[position]
+                distance = current_distance
+            position = (position + 1) % self.table_size
+            distance += 1
+
+        self.slots[position] = index
+
+    def _place(self, index: int) -> None:
+        """
+        Place the entry at index, whose key is not in the table, in a free slot.
+        :pre: the table is not full
+        :complexity: See _linear_probe (no keys are compared).
+        """
+        if self.robin_hood:
+            self._robin_hood_insert(index)
+            return
+        position = self.home(index)
+        while self.slots[position] != self.EMPTY:
+            position = (position + 1) % self.table_size
+        self.slots[position] = index
+
+    def _append_entry(self, key: K, data: V, full_hash: int) -> int:
+        """
+        Add an entry to the end of the dense lists and return its index.
+        :complexity: amortised O(1)
+        """
+        self.entry_keys.append(key)
+        self.entry_values.append(data)
+        self.entry_hashes.append(full_hash)
+        return len(self.entry_keys) - 1
+
     def keys(self) -> list[K]:
         """
-        Returns all keys in the hash table.
+        Returns all keys in the hash table, in insertion order.
 
-        :complexity: O(N) where N is self.table_size.
+        :complexity: O(N) where N is len(self).
         """
-        res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][0])
-        return res
+        return [key for key in self.entry_keys if key is not self.HOLE]
 
     def values(self) -> list[V]:
         """
-        Returns all values in the hash table.
+        Returns all values in the hash table, in insertion order.
 
-        :complexity: O(N) where N is self.table_size.
+        :complexity: O(N) where N is len(self).
         """
         res = []
-        for x in range(self.table_size):
-            if self.array[x] is not None:
-                res.append(self.array[x][1])
+        for index in range(len(self.entry_keys)):
+            if self.entry_keys[index] is not self.HOLE:
+                res.append(self.entry_values[index])
         return res
 
     def __contains__(self, key: K) -> bool:
@@ -143,46 +353,97 @@ class LinearProbeTable(Generic[K, V]):
         :raises KeyError: when the key doesn't exist.
         """
         position = self._linear_probe(key, False)
-        return self.array[position][1]
+        return self.entry_values[self.slots[position]]
 
     def __setitem__(self, key: K, data: V) -> None:
         """
         Set an (key, value) pair in our hash table.
+        A new key goes to the end of the insertion order, an existing key keeps its place.
 
         :complexity: See linear probe.
         :raises FullError: when the table cannot be resized further.
         """
+        full_hash = self.full_hash(key) if self.cache_hashes else None
+
+        if self.robin_hood:
+            try:
+                position = self._robin_hood_probe(key, full_hash)
+            except KeyError:
+                if self.is_full():
+                    raise FullError("Table is full!")
+                self._robin_hood_insert(self._append_entry(key, data, full_hash))
+                self.count += 1
+            else:
+                self.entry_values[self.slots[position]] = data
+        else:
+            position = self._linear_probe(key, True, full_hash)
+            if self.slots[position] == self.EMPTY:
+                self.slots[position] = self._append_entry(key, data, full_hash)
+                self.count += 1
+            else:
+                self.entry_values[self.slots[position]] = data
 
-        position = self._linear_probe(key, True)
-
-        if self.array[position] is None:
-            self.count += 1
-
-        self.array[position] = (key, data)
-
-        if len(self) > self.table_size / 2:
+        if len(self) > self.table_size * self.max_load:
             self._rehash()
 
     def __delitem__(self, key: K) -> None:
         """
         Deletes a (key, value) pair in our hash table.
+        The entry becomes a hole in the dense lists, and its slot is refilled by
+        backward-shift deletion (see _shift_back). Afterwards the table shrinks if it is
+        now sparse, or the dense lists are compacted if they are mostly holes.
 
         :complexity best: O(hash(key)) deleting item is not probed and in correct spot.
-        :complexity worst: O(N*hash(key)+N^2*comp(K)) deleting item is midway through large chain.
+        :complexity worst: O(hash(key) + C*hash(K)) where C is the length of the rest of the
+                        cluster (O(hash(key) + C) when hashes are cached).
+                        Shrinking and compacting are amortised O(1) per delete.
         :raises KeyError: when the key doesn't exist.
         """
-        position = self._linear_probe(key, False)
-        # Remove the element
-        self.array[position] = None
+        hole = self._linear_probe(key, False)
+        index = self.slots[hole]
+        self.entry_keys[index] = self.HOLE
+        self.entry_values[index] = None
+        self.entry_hashes[index] = None
         self.count -= 1
-        # Start moving over the cluster
-        position = (position + 1) % self.table_size
-        while self.array[position] is not None:
-            key2, value = self.array[position]
-            self.array[position] = None
-            # Reinsert.
-            newpos = self._linear_probe(key2, True)
-            self.array[newpos] = (key2, value)
+
+        self._shift_back(hole)
+
+        if self.size_index > 0 and len(self) < self.table_size * self.max_load * self.SHRINK_LOAD:
+            # Shrink to a table at most half of max_load full, so it does not grow straight back
+            self._resize(min(self.size_index, self.size_index_for(2 * len(self))))
+        elif len(self.entry_keys) > 2 * len(self):
+            self._resize(self.size_index)
+
+    def _shift_back(self, hole: int) -> None:
+        """
+        Refill the empty slot at hole by backward-shift deletion.
+        The rest of the cluster is scanned once, and each entry that can no longer
+        be reached across the hole is moved back into it, leaving a new hole behind.
+        Entries sitting between the hole and their home position stay put.
+        In a Robin Hood table the entries are shifted back one slot each, until one is at its home.
+        The hole is kept EMPTY throughout, so in a full table the scan stops when it wraps
+        around to it, and never goes more than table_size slots.
+
+        :complexity: O(C*hash(K)) where C is the length of the rest of the cluster
+                     (O(C) when hashes are cached).
+        """
+        self.slots[hole] = self.EMPTY
+        position = (hole + 1) % self.table_size
+        for _ in range(self.table_size - 1):
+            index = self.slots[position]
+            if index == self.EMPTY:
+                break
+            if self.robin_hood:
+                if self.distance(position) == 0:
+                    break
+                move = True
+            else:
+                # The entry may fill the hole if its home is not in (hole, position] (cyclically)
+                move = (position - self.home(index)) % self.table_size >= (position - hole) % self.table_size
+            if move:
+                self.slots[hole] = index
+                self.slots[position] = self.EMPTY
+                hole = position
             position = (position + 1) % self.table_size
 
     def is_empty(self) -> bool:
@@ -195,31 +456,39 @@ class LinearProbeTable(Generic[K, V]):
         """
         Need to resize table and reinsert all values
 
-        :complexity best: O(N*hash(K)) No probing.
-        :complexity worst: O(N*hash(K) + N^2*comp(K)) Lots of probing.
-        Where N is len(self)
+        :complexity: See _resize.
         """
-        old_array = self.array
-        self.size_index += 1
-        if self.size_index >= len(self.TABLE_SIZES):
+        if self.size_index + 1 >= len(self.TABLE_SIZES):
             # Cannot be resized further.
             return
-        self.array = ArrayR(self.TABLE_SIZES[self.size_index])
-        self.count = 0
-        for item in old_array:
-            if item is not None:
-                key, value = item
-                self[key] = value
+        self._resize(self.size_index + 1)
+
+    def _resize(self, size_index: int) -> None:
+        """
+        Move every entry into a table of size TABLE_SIZES[size_index],
+        compacting the holes out of the dense lists on the way.
+
+        :complexity best: O(N*hash(K)) No probing.
+        :complexity worst: O(N*hash(K) + N^2) Lots of probing.
+        Where N is len(self) (hash(K) is O(1) when hashes are cached).
+        No keys are compared, as they are all known to differ.
+        """
+        keys, values, hashes = self.entry_keys, self.entry_values, self.entry_hashes
+        self.size_index = size_index
+        self.slots = array('q', [self.EMPTY]) * self.TABLE_SIZES[size_index]
+        self.entry_keys, self.entry_values, self.entry_hashes = [], [], []
+        for index in range(len(keys)):
+            if keys[index] is not self.HOLE:
+                self._place(self._append_entry(keys[index], values[index], hashes[index]))
 
     def __str__(self) -> str:
         """
-        Returns all they key/value pairs in our hash table (no particular
-        order).
-        :complexity: O(N * (str(key) + str(value))) where N is the table size
+        Returns all they key/value pairs in our hash table, in insertion order.
+        :complexity: O(N * (str(key) + str(value))) where N is len(self)
         """
         result = ""
-        for item in self.array:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for index in range(len(self.entry_keys)):
+            key = self.entry_keys[index]
+            if key is not self.HOLE:
+                result += "(" + str(key) + "," + str(self.entry_values[index]) + ")\n"
         return result
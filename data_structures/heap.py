@@ -8,6 +8,12 @@ from data_structures.referential_array import ArrayR, T
 
 
 class MaxHeap(Generic[T]):
+    """
+    Max heap stored from index 1 of an ArrayR.
+    The array doubles when an element is added to a full heap, and halves
+    when the heap falls below a quarter of its capacity, so max_size is only
+    the starting capacity.
+    """
     MIN_CAPACITY = 1
 
     def __init__(self, max_size: int) -> None:
@@ -17,9 +23,41 @@ class MaxHeap(Generic[T]):
     def __len__(self) -> int:
         return self.length
 
+    @property
+    def capacity(self) -> int:
+        """ Number of elements the heap can hold before it has to grow. """
+        return len(self.the_array) - 1
+
     def is_full(self) -> bool:
         return self.length + 1 == len(self.the_array)
 
+    def resize(self, capacity: int) -> None:
+        """
+        Move the elements into a new array with room for capacity elements
+        :pre: capacity >= self.length
+        :complexity: O(capacity)
+        """
+        new_array = ArrayR(max(self.MIN_CAPACITY, capacity) + 1)
+        for k in range(1, self.length + 1):
+            new_array[k] = self.the_array[k]
+        self.the_array = new_array
+
+    def reserve(self, n: int) -> None:
+        """
+        Make sure the heap can hold n elements without growing
+        :complexity: O(n) if the array is reallocated, O(1) otherwise
+        """
+        if n > self.capacity:
+            self.resize(n)
+
+    def shrink_if_sparse(self) -> None:
+        """
+        Halve the array when less than a quarter of it is in use
+        :complexity: amortised O(1)
+        """
+        if self.capacity > self.MIN_CAPACITY and self.length < self.capacity // 4:
+            self.resize(self.capacity // 2)
+
     def rise(self, k: int) -> None:
         """
         Rise element at index k to its correct position
@@ -34,9 +72,11 @@ class MaxHeap(Generic[T]):
     def add(self, element: T) -> bool:
         """
         Swaps elements while rising
+        The array doubles first if the heap is full
+        :complexity: amortised O(log n)
         """
         if self.is_full():
-            raise IndexError
+            self.resize(2 * self.capacity)
 
         self.length += 1
         self.the_array[self.length] = element
@@ -80,11 +120,13 @@ class MaxHeap(Generic[T]):
         if self.length > 0:
             self.the_array[1] = self.the_array[self.length+1]
             self.sink(1)
+        self.the_array[self.length+1] = None
+        self.shrink_if_sparse()
         return max_elt
 
     @classmethod
     def heapify(cls, points: ArrayR[T], overwrite_size: int = 0) -> MaxHeap[T]:
-        self = MaxHeap(overwrite_size or (2 * len(points) + 2))
+        self = cls(overwrite_size or len(points))
         self.length = len(points)
         for i in range(len(points)):
             self.the_array[i+1] = points[i]
@@ -0,0 +1,160 @@
+"""Indexed Max Heap implemented using an array.
+
+Elements are (priority, handle) pairs. The heap remembers the slot each handle
+is stored in, so the priority of an element can be changed, or the element
+removed, without searching for it.
+"""
+from __future__ import annotations
+__docformat__ = 'reStructuredText'
+
+from typing import Generic, Hashable, TypeVar
+from data_structures.heap import MaxHeap
+from data_structures.referential_array import ArrayR
+
+P = TypeVar('P')
+H = TypeVar('H', bound=Hashable)
+
+
+class IndexedMaxHeap(MaxHeap, Generic[P, H]):
+    """
+    Max heap of (priority, handle) pairs with a handle -> slot map.
+    Pairs are compared as tuples, so equal priorities are broken by handle.
+    Each handle can be in the heap at most once.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        MaxHeap.__init__(self, max_size)
+        self.positions = {}
+
+    def __contains__(self, handle: H) -> bool:
+        """
+        Checks whether the handle is in the heap
+        :complexity: O(1)
+        """
+        return handle in self.positions
+
+    def place(self, k: int, element: tuple[P, H]) -> None:
+        """
+        Store the element at slot k and record the slot for its handle
+        :complexity: O(1)
+        """
+        self.the_array[k] = element
+        self.positions[element[1]] = k
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position, keeping the slots of every moved handle
+        :pre: 1 <= k <= self.length
+        :complexity: O(log n)
+        """
+        item = self.the_array[k]
+        while k > 1 and item > self.the_array[k // 2]:
+            self.place(k, self.the_array[k // 2])
+            k = k // 2
+        self.place(k, item)
+
+    def sink(self, k: int) -> None:
+        """
+        Make the element at index k sink to the correct position, keeping the slots of every moved handle
+        :pre: 1 <= k <= self.length
+        :complexity: O(log n)
+        """
+        item = self.the_array[k]
+
+        while 2 * k <= self.length:
+            max_child = self.largest_child(k)
+            if self.the_array[max_child] <= item:
+                break
+            self.place(k, self.the_array[max_child])
+            k = max_child
+
+        self.place(k, item)
+
+    def add(self, element: tuple[P, H]) -> None:
+        """
+        Add a (priority, handle) pair
+        :complexity: amortised O(log n)
+        :raises ValueError: if the handle is already in the heap
+        """
+        if element[1] in self.positions:
+            raise ValueError('Handle already in heap: {0}'.format(element[1]))
+        MaxHeap.add(self, element)
+
+    def peek(self) -> tuple[P, H]:
+        """
+        Return the maximum (priority, handle) pair without removing it
+        :complexity: O(1)
+        :raises IndexError: if the heap is empty
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
+
+    def peek_second(self) -> tuple[P, H] | None:
+        """
+        Return the largest pair other than the maximum, or None if there is none.
+        It is always one of the children of the root.
+        :complexity: O(1)
+        """
+        if self.length < 2:
+            return None
+        return self.the_array[self.largest_child(1)]
+
+    def get_max(self) -> tuple[P, H]:
+        """
+        Remove (and return) the maximum (priority, handle) pair
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        max_elt = MaxHeap.get_max(self)
+        del self.positions[max_elt[1]]
+        return max_elt
+
+    def update(self, handle: H, new_priority: P) -> None:
+        """
+        Change the priority of the element with the given handle
+        :complexity: O(log n)
+        :raises KeyError: if the handle is not in the heap
+        """
+        k = self.positions[handle]
+        old = self.the_array[k]
+        self.the_array[k] = (new_priority, handle)
+        if self.the_array[k] > old:
+            self.rise(k)
+        else:
+            self.sink(k)
+
+    def remove(self, handle: H) -> P:
+        """
+        Remove the element with the given handle and return its priority
+        :complexity: O(log n)
+        :raises KeyError: if the handle is not in the heap
+        """
+        k = self.positions.pop(handle)
+        removed = self.the_array[k]
+        last = self.the_array[self.length]
+        self.the_array[self.length] = None
+        self.length -= 1
+        if k <= self.length:
+            # Fill the hole with the last element, which may need to go either way
+            self.place(k, last)
+            self.rise(k)
+            self.sink(self.positions[last[1]])
+        self.shrink_if_sparse()
+        return removed[0]
+
+    @classmethod
+    def heapify(cls, points: ArrayR[tuple[P, H]], overwrite_size: int = 0) -> IndexedMaxHeap[P, H]:
+        """
+        Build a heap from (priority, handle) pairs in O(n)
+        :raises ValueError: if two pairs share a handle
+        """
+        self = cls(overwrite_size or len(points))
+        self.length = len(points)
+        for i in range(len(points)):
+            if points[i][1] in self.positions:
+                raise ValueError('Handle already in heap: {0}'.format(points[i][1]))
+            self.place(i + 1, points[i])
+        for k in range(len(points) // 2, 0, -1):
+            self.sink(k)
+        return self
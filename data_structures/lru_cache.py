@@ -0,0 +1,122 @@
+""" Least-recently-used cache.
+    Defines a cache bounded by the (estimated) number of bytes its values use.
+    When a new value does not fit, the least recently used values are evicted.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+import sys
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class LRUCache(Generic[K, V]):
+    """
+    LRU cache with hit, miss and eviction counters.
+
+    Entries are kept in an OrderedDict from least to most recently used, so
+    lookups, insertions and single evictions are all O(1).
+    The size of an entry is estimated with sys.getsizeof on the value and,
+    for lists and tuples, on each of its elements (elements shared with other
+    objects, like islands, are counted by their reference only).
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+            Initialises an empty cache holding at most max_bytes of values
+            :complexity: O(1)
+        """
+        self.entries = OrderedDict()
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of entries in the cache. """
+        return len(self.entries)
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks whether key is cached, without counting a hit or miss or changing its recency
+            :complexity: O(1)
+        """
+        return key in self.entries
+
+    @staticmethod
+    def size_of(value: V) -> int:
+        """
+            Estimated number of bytes used by value
+            :complexity: O(len(value)) for lists and tuples, O(1) otherwise
+        """
+        size = sys.getsizeof(value)
+        if isinstance(value, (list, tuple)):
+            for element in value:
+                size += sys.getsizeof(element)
+        return size
+
+    def get(self, key: K) -> V:
+        """
+            Returns the value cached for key and marks it as most recently used
+            :complexity: O(1)
+            :raises KeyError: if the key is not cached
+        """
+        try:
+            value, _ = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+            Cache value under key, evicting least recently used entries until it fits.
+            A value larger than the whole cache is not stored.
+            :complexity: O(size of value) to measure it, plus O(1) per eviction;
+                O(1) when the cache is off or the list or tuple alone is over the bound
+        """
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        # The elements are only measured if the value could fit at all
+        if self.max_bytes <= 0 or sys.getsizeof(value) > self.max_bytes:
+            return
+        size = self.size_of(value)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = (value, size)
+        self.current_bytes += size
+        self.evict_to(self.max_bytes)
+
+    def evict_to(self, max_bytes: int) -> None:
+        """
+            Evict least recently used entries until at most max_bytes are used
+            :complexity: O(1) per eviction
+        """
+        while self.current_bytes > max_bytes:
+            _, (_, size) = self.entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """
+            Change the memory bound, evicting entries if the cache is now over it
+            :complexity: O(1) per eviction
+        """
+        self.max_bytes = max_bytes
+        self.evict_to(max_bytes)
+
+    def clear(self) -> None:
+        """
+            Remove every entry, keeping the counters
+            :complexity: O(N)
+        """
+        self.entries.clear()
+        self.current_bytes = 0
@@ -11,7 +11,11 @@ __docformat__ = 'reStructuredText'
 
 
 class TreeNode(Generic[K, I]):
-    """ Node class represent BST nodes. """
+    """ Node class represent BST nodes.
+        Uses __slots__ so nodes carry no per-instance __dict__.
+    """
+
+    __slots__ = ('key', 'item', 'left', 'right')
 
     def __init__(self, key: K, item: I = None) -> None:
         """
@@ -37,6 +41,8 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
     """
 
+    __slots__ = ('height',)
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -0,0 +1,155 @@
+""" Order-statistic AVL Tree.
+    Defines an AVL tree where every node also stores the size of its sub-tree
+    and the total marines and money of the items in it. Items are expected to
+    have marines and money attributes, like Island.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'reStructuredText'
+
+from typing import Generic
+from data_structures.avl import AVLTree
+from data_structures.bst import K, I
+from data_structures.node import AVLTreeNode
+
+
+class OrderStatisticTreeNode(AVLTreeNode, Generic[K, I]):
+    """ Node class for order-statistic trees. """
+
+    __slots__ = ('size', 'marines', 'money')
+
+    def __init__(self, key: K, item: I = None, marines: int = 0, money: float = 0) -> None:
+        """
+            Initialises a leaf node, its sub-tree totals are the weights of its own item
+            :complexity: O(1)
+        """
+        super(OrderStatisticTreeNode, self).__init__(key, item)
+        self.size = 1
+        self.marines = marines
+        self.money = money
+
+
+class OrderStatisticTree(AVLTree, Generic[K, I]):
+    """
+    AVL tree augmented with sub-tree size, total marines and total money.
+    The totals are recomputed whenever a node's height is, so they stay correct
+    through inserts, deletes and rotations.
+
+    If an item's marines or money change while it is in the tree, call refresh(key).
+    Subclasses can override item_weights to hold items that are not island-like.
+    """
+
+    @staticmethod
+    def item_weights(item: I) -> tuple[int, float]:
+        """
+            The (marines, money) an item adds to its sub-tree.
+            An item without marines adds no money: no crew is ever sent to it.
+            :complexity: O(1)
+        """
+        if item is None or item.marines <= 0:
+            return 0, 0
+        return item.marines, item.money
+
+    def create_node(self, key: K, item: I) -> OrderStatisticTreeNode:
+        """
+            Create an OrderStatisticTreeNode for a single item.
+            :complexity: O(1)
+        """
+        return OrderStatisticTreeNode(key, item, *self.item_weights(item))
+
+    def update_height(self, current: OrderStatisticTreeNode) -> None:
+        """
+            Recompute the height, size and totals of current from its children and item.
+            :complexity: O(1)
+        """
+        AVLTree.update_height(self, current)
+        size = 1
+        marines, money = self.item_weights(current.item)
+        for child in (current.left, current.right):
+            if child is not None:
+                size += child.size
+                marines += child.marines
+                money += child.money
+        current.size = size
+        current.marines = marines
+        current.money = money
+
+    def refresh(self, key: K) -> None:
+        """
+            Recompute the totals on the path to key, after its item has changed.
+            :complexity: O(CompK * log(N))
+            :raises KeyError: if the key is not in the tree
+        """
+        self.refresh_aux(self.root, key)
+
+    def refresh_aux(self, current: OrderStatisticTreeNode, key: K) -> None:
+        if current is None:
+            raise KeyError('Key not found: {0}'.format(key))
+        elif key < current.key:
+            self.refresh_aux(current.left, key)
+        elif key > current.key:
+            self.refresh_aux(current.right, key)
+        self.update_height(current)
+
+    def rank(self, key: K) -> int:
+        """
+            The number of keys in the tree smaller than key.
+            :complexity: O(CompK * log(N))
+        """
+        rank = 0
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                current = current.left
+            else:
+                rank += 1 + (current.left.size if current.left is not None else 0)
+                current = current.right
+        return rank
+
+    def select(self, k: int) -> OrderStatisticTreeNode:
+        """
+            The node with the k-th smallest key, counting from 0.
+            :complexity: O(log(N))
+            :raises IndexError: if k is not in [0, len(self))
+        """
+        if not 0 <= k < len(self):
+            raise IndexError('Rank out of range: {0}'.format(k))
+        current = self.root
+        while True:
+            left_size = current.left.size if current.left is not None else 0
+            if k < left_size:
+                current = current.left
+            elif k == left_size:
+                return current
+            else:
+                k -= left_size + 1
+                current = current.right
+
+    def prefix_by_marines(self, crew: int) -> float:
+        """
+            The money made by sending crew pirates through the items in key order,
+            plundering each fully before moving on, and the last one partially.
+            Descends once, taking whole left sub-trees from their totals.
+            :complexity: O(log(N))
+        """
+        money = 0
+        current = self.root
+        while current is not None and crew > 0:
+            left = current.left
+            left_marines = left.marines if left is not None else 0
+            if crew < left_marines:
+                current = left
+                continue
+            if left is not None:
+                money += left.money
+            crew -= left_marines
+
+            item_marines, item_money = self.item_weights(current.item)
+            if crew < item_marines:
+                # the crew runs out part way through this item
+                return money + item_money * crew / item_marines
+            money += item_money
+            crew -= item_marines
+            current = current.right
+        return money
@@ -32,7 +32,7 @@ ISLAND_NAMES = [
     "Whole Cake Island",
 ]
 
-@dataclass
+@dataclass(slots=True)
 class Island:
 
     name: str
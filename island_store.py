@@ -0,0 +1,116 @@
+from __future__ import annotations
+from array import array
+from island import Island
+
+
+class IslandView:
+    """
+    An island stored in an IslandStore, referred to by its index.
+    Reads and writes of name, money and marines go straight to the store's columns,
+    so it can be used anywhere an Island is.
+    Views are created on demand, so two views of the same island are equal (and hash
+    the same) without being the same object.
+    """
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: IslandStore, index: int) -> None:
+        self.store = store
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.store.names[self.index]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.store.names[self.index] = value
+
+    @property
+    def money(self) -> float:
+        return self.store.money[self.index]
+
+    @money.setter
+    def money(self, value: float) -> None:
+        self.store.money[self.index] = value
+
+    @property
+    def marines(self) -> int:
+        return self.store.marines[self.index]
+
+    @marines.setter
+    def marines(self, value: int) -> None:
+        self.store.marines[self.index] = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IslandView):
+            return NotImplemented
+        return self.store is other.store and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.store), self.index))
+
+    def to_island(self) -> Island:
+        """ Copy this island out of the store. """
+        return Island(self.name, self.money, self.marines)
+
+    def __repr__(self) -> str:
+        return 'IslandView(name={0!r}, money={1!r}, marines={2!r})'.format(self.name, self.money, self.marines)
+
+
+class IslandStore:
+    """
+    Columnar storage for many islands.
+    Names, money and marines are kept in parallel columns, with money and marines
+    in typed arrays (array('d') and array('q')) rather than one object per island.
+
+    Indexing or iterating hands out IslandViews. Views are created on demand and not kept,
+    so the store holds no object per island; an island is identified by its store and index.
+
+    Unless stated otherwise, all methods have O(1) complexity.
+    """
+
+    def __init__(self, islands: list[Island] = None) -> None:
+        """
+        Creates a store, copying in the given islands
+
+        :complexity: O(n) where n is the number of islands
+        """
+        self.names = []
+        self.money = array('d')
+        self.marines = array('q')
+        if islands is not None:
+            for island in islands:
+                self.append(island.name, island.money, island.marines)
+
+    def append(self, name: str, money: float, marines: int) -> None:
+        """
+        Adds an island to the end of the store, its view is store[len(store) - 1]
+
+        :complexity: amortised O(1)
+        """
+        self.names.append(name)
+        self.money.append(money)
+        self.marines.append(marines)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> IslandView:
+        """
+        Returns a view of the island at index
+
+        :raises IndexError: when index is out of range
+        """
+        if not -len(self.names) <= index < len(self.names):
+            raise IndexError('Island index out of range: {0}'.format(index))
+        return IslandView(self, index % len(self.names))
+
+    def __iter__(self):
+        """
+        Iterates over the views of every island, in order
+
+        :complexity: O(n) where n is the number of islands
+        """
+        for index in range(len(self.names)):
+            yield self[index]
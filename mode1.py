@@ -1,51 +1,260 @@
+import sys
 from island import Island
-from data_structures.bst import BinarySearchTree
-from data_structures.bst import BSTInOrderIterator
+from island_store import IslandStore, IslandView
+from data_structures.order_statistic_tree import OrderStatisticTree
+from data_structures.bst import BSTMorrisIterator
+from data_structures.heap import MaxHeap
+from data_structures.hash_table import LinearProbeTable
+from data_structures.lru_cache import LRUCache
 from algorithms.mergesort import mergesort
-from algorithms.binary_search import binary_search
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path is used without it
+    np = None
+
+class RatioBucket:
+    """
+    The islands sharing one ratio of marines to money, in the order they were added.
+    Only used once a second island has the ratio: a node whose ratio is unique holds its island directly.
+    Keeps the total marines and money of its islands so the tree can treat the
+    bucket like a single island. The weights of each island are given by the
+    caller, as the tree's item_weights (an island without marines adds no money).
+
+    The islands (or, for a navigator over an IslandStore, their store indices) are kept
+    in a dict by island id (see Mode1Navigator.island_id), which preserves their order
+    and lets one be removed without scanning the bucket.
+    """
+
+    __slots__ = ('islands', 'marines', 'money')
+
+    def __init__(self) -> None:
+        self.islands = {}
+        self.marines = 0
+        self.money = 0
+
+    def add(self, island_id: int | tuple[int, int], island: Island | int, marines: int, money: float) -> None:
+        """
+        Add an island to the end of the bucket, with the marines and money it adds to the totals
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        self.islands[island_id] = island
+        self.marines += marines
+        self.money += money
+
+    def remove(self, island_id: int | tuple[int, int], marines: int, money: float) -> None:
+        """
+        Remove an island from the bucket, subtracting the weights it was added with from the totals
+
+        :complexity:
+            Best/Worst: O(1)
+        :raises KeyError: if the island is not in the bucket
+        """
+        del self.islands[island_id]
+        self.marines -= marines
+        self.money -= money
+        if self.marines == 0:
+            # no island left adds money, so clear any rounding left by the subtractions
+            self.money = 0
+
+    def __len__(self) -> int:
+        return len(self.islands)
+
+    def __iter__(self):
+        return iter(self.islands.values())
+
+
+class StoreIslandTree(OrderStatisticTree):
+    """
+    OrderStatisticTree over the islands of one IslandStore, held by their store index
+    The weights of an index are read from the store's columns, so no view is kept per island.
+    """
+
+    def __init__(self, store: IslandStore) -> None:
+        super().__init__()
+        self.store = store
+
+    def item_weights(self, item: int | RatioBucket) -> tuple[int, float]:
+        """
+        The (marines, money) a store index, or a bucket of them, adds to its sub-tree
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        if isinstance(item, RatioBucket):
+            return OrderStatisticTree.item_weights(item)
+        marines = self.store.marines[item]
+        if marines <= 0:
+            return 0, 0
+        return marines, self.store.money[item]
+
 
 class Mode1Navigator:
     """
     Student-TODO: short paragraph as per https://edstem.org/au/courses/12108/lessons/42810/slides/294117
 
 
-    The Mode1Navigator class employs a Binary Search Tree (BST) data structure for this purpose. 
+    The Mode1Navigator class employs an order-statistic AVL tree (a self-balancing Binary Search Tree that also keeps subtree totals) for this purpose.
+    Keeping the tree balanced means the depth stays O(logn) even when the islands arrive already sorted by ratio.
     The complexity analysis is as follows:
     
     Initialization (init): The complexity is O(nlogn) in the worst and best cases, where n is the number of islands. This is because each island needs to be inserted into the BST, resulting in n iterations through the islands, with each insertion taking O(logn) time.
 
+    Add Islands / Remove Island: O(logn) per island, using the same bucket operations as Update Island. The subtree totals are patched on the way, so nothing is rebuilt.
+
+    Select Islands Once: For one-shot planning the islands can instead be heapified in O(n), and only the k islands the crew reaches are extracted, giving O(n + klogn) overall.
+
     Select Islands: In the best case, this operation takes O(1) time when all the crew is assigned to the first island, breaking out of the loop early. In the worst case, it takes O(n) time when all islands need to be considered. This operation involves traversing the entire BST.
 
-    Update Island: Both the best and worst cases for updating an island are O(logn), as it requires searching for the specific island node within the BST. 
+    Islands with the same ratio share one node, which holds a RatioBucket of them in the order they were given, so equal ratios (and islands without money, whose ratio is infinite) never clash in the tree. A node whose ratio is unique holds its island directly, so the bucket is only paid for where ratios repeat.
+
+    Update Island: Both the best and worst cases for updating an island are O(logn). A LinearProbeTable maps each island to its current key, so the island can be taken out of its bucket and added to the bucket for its new ratio without searching the whole tree. 
+
+    Built from an IslandStore, the tree holds store indices rather than islands, and views are only created for the islands a query returns; the navigator then only holds islands of that store.
 
-    Select Islands from Crew Numbers: In the 1008 version, the worst case is O(C * N), where C is the number of crew members, and N is the number of islands. It occurs when the entire tree is traversed for each crew number. In the 1054 version, the worst case is O(N + ClogC), as it traverses the tree once and sorts the crew numbers with a complexity of ClogC.
+    Repeated calls to Select Islands and Select Islands from Crew Numbers with the same crew are answered from a bounded LRU cache until the islands next change.
+
+    Select Islands from Crew Numbers: In the 1008 version, the worst case is O(C * N), where C is the number of crew members, and N is the number of islands. It occurs when the entire tree is traversed for each crew number. In the 1054 version, the worst case is O(N + ClogC), as it traverses the tree once and sorts the crew numbers with a complexity of ClogC. The current version keeps the total marines and money of every subtree in the tree itself, so each crew number is answered with a single O(logN) descent, and the totals stay correct as islands are updated.
 
     In summary, the algorithm's overall time complexity mainly depends on the operations performed with the BST. Initialization and selecting islands can be time-consuming, especially when all islands need to be considered. Updating islands and selecting islands based on crew numbers have more predictable and efficient complexities.
         
 
     """
 
-    def __init__(self, islands: list[Island], crew: int) -> None:
+    # Batches of at least this many crew numbers use the NumPy engine when it is installed
+    NUMPY_BATCH_SIZE = 256
+    # Default memory bound of the query result cache, in bytes
+    CACHE_MAX_BYTES = 1 << 20
+
+    def __init__(self, islands: list[Island] | IslandStore, crew: int) -> None:
         """
         Student-TODO: Best/Worst Case
 
+        The islands can also be given as an IslandStore. The tree then holds store indices,
+        and queries return views of the store.
+
         :complexity:
             Best / worst case: O(nlogn)
                 - n is the number of islands
-                - occurs when we have to insert all the islands into the tree
+                - the islands are sorted by ratio once with mergesort
+                - islands with equal ratios are grouped into one bucket as the sorted list is read,
+                  an island with a unique ratio is stored in its node as is
+                - the balanced tree is then bulk-loaded in O(n)
         """
         
-        self.island_tree = BinarySearchTree() 
         self.crew = crew
+        self.store = islands if isinstance(islands, IslandStore) else None
+
+        # key is the ratio of marines to money
+            # This is because we want to attack the island that will give us the most money per marine
+            # so these islands will be at the left of the tree when using in order traversal
+                # larger ratio = less money per marine
+        entries = [(self.island_key(island), self.island_id(island), island) for island in islands]
+        # mergesort is stable, so islands with equal ratios stay in the order given
+        entries = mergesort(entries, key=lambda entry: entry[0])
+
+        # Reverse index from island identity to its current key in the tree
+            # so update_island can find the node without a full search
+        self.island_keys = LinearProbeTable.from_items(
+            [(island_id, key) for key, island_id, _ in entries], cache_hashes=True)
+        if self.store is not None:
+            self.island_tree = StoreIslandTree(self.store)
+        else:
+            self.island_tree = OrderStatisticTree()
+        nodes = []
+        start = 0
+        while start < len(entries):
+            end = start + 1
+            while end < len(entries) and entries[end][0] == entries[start][0]:
+                end += 1
+            if end - start == 1:
+                key, island_id, island = entries[start]
+                nodes.append((key, self.tree_entry(island_id, island)))
+            else:
+                bucket = RatioBucket()
+                for _, island_id, island in entries[start:end]:
+                    entry = self.tree_entry(island_id, island)
+                    bucket.add(island_id, entry, *self.island_tree.item_weights(entry))
+                nodes.append((entries[start][0], bucket))
+            start = end
+        self.island_tree.bulk_load(nodes, presorted=True)
+
+        # Arrays for the NumPy engine, built on first use
+        self.numpy_index = None
+
+        # Query results are cached by (query, version, crew)
+            # the version is bumped whenever the islands change, so older results are never returned
+        self.version = 0
+        self.cache = LRUCache(self.CACHE_MAX_BYTES)
+
+    @staticmethod
+    def island_key(island: Island) -> float:
+        """
+        The key of an island in the tree: its ratio of marines to money
+        An island without money goes after every other island
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        if island.money == 0:
+            return float('inf')
+        return island.marines / island.money
+
+    def island_id(self, island: Island) -> int | tuple[int, int]:
+        """
+        The key of an island in the reverse index.
+        Islands can share names, so their identity is used instead.
+        An island in an IslandStore is identified by its store and index, as its views are not kept;
+        a navigator built from a store only holds islands of that store, so the index is enough.
+
+        :complexity:
+            Best/Worst: O(1)
+        :raises KeyError: if the navigator was built from an IslandStore and the island is
+            not in that store
+        """
+        if self.store is not None:
+            if not isinstance(island, IslandView) or island.store is not self.store:
+                raise KeyError('Island not in the navigator\'s store: {0}'.format(island.name))
+            return island.index
+        if isinstance(island, IslandView):
+            return id(island.store), island.index
+        return id(island)
+
+    def tree_entry(self, island_id: int | tuple[int, int], island: Island) -> Island | int:
+        """
+        What the tree holds for an island: its store index, or the island itself
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        if self.store is not None:
+            return island_id
+        return island
 
+    def to_island(self, entry: Island | int) -> Island:
+        """
+        The island for an entry of the tree, as a view when the entry is a store index
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        if self.store is not None:
+            return IslandView(self.store, entry)
+        return entry
 
+    @staticmethod
+    def node_entries(item: Island | int | RatioBucket) -> RatioBucket | tuple[Island | int]:
+        """
+        The entries held by a node of the tree: its bucket, or its only entry
 
-        for island in islands:
-            # key is the ratio of marines to money
-                # This is because we want to attack the island that will give us the most money per marine
-                # so these islands will be at the left of the tree when using in order traversal
-                    # larger ratio = less money per marine
-            self.island_tree[island.marines / island.money] = island
+        :complexity:
+            Best/Worst: O(1)
+        """
+        if isinstance(item, RatioBucket):
+            return item
+        return (item,)
 
     def select_islands(self) -> list[tuple[Island, int]]:
         """
@@ -55,15 +264,25 @@ class Mode1Navigator:
         Student-TODO: Best/Worst Case
 
         :complexity: 
-            Best Case: O(1)
+            Best Case: O(log^2(n))
                 - Occurs when when we send all crew members to the first island
                     - Break out of the loop after the first iteration
+                    - closing the iterator removes the threads on the path to the next island
             Worst Case: O(n)
                 - n is the number of islands 
                 - occurs when we have to traverse the entire tree
+            Cached: O(k)
+                - the islands have not changed since the last call with this crew
+                - k is the number of islands selected, to copy the cached list
 
  
         """
+        cache_key = ('select_islands', self.version, self.crew)
+        try:
+            return list(self.cache.get(cache_key))
+        except KeyError:
+            pass
+
         selected_islands = []
 
         # copy crew to a variable so we can decrement it
@@ -71,27 +290,69 @@ class Mode1Navigator:
         crew = self.crew
         # Create an in order iterator to traverse the tree
             # this is so its sorted from smallest to largest ratio
+            # the Morris iterator needs no stack, and closing it at the end of the with block
+            # restores the tree if we stop early
+
+        with BSTMorrisIterator(self.island_tree.root) as iterator:
+            for node in iterator:
+                # every island in the node has the same ratio
+                for entry in self.node_entries(node.item):
+                    if crew <= 0:
+                        break
+                    island = self.to_island(entry)
+                    # if there are more marines than crew, send all the crew
+                    crew_sent = min(island.marines, crew)
+                    selected_islands.append((island, crew_sent))
+                    crew -= crew_sent
+                if crew <= 0:
+                    break
 
-        iterator = BSTInOrderIterator(self.island_tree.root)
+        self.cache.put(cache_key, selected_islands)
+        return list(selected_islands)
 
-        while crew > 0:
-            try:
-                # get the next node in the tree
-                node = next(iterator)
-                island = node.item
-                marines = island.marines
-
-                # if there are more marines than crew, send all the crew
-                crew_sent = min(marines, crew)
-                selected_islands.append((island, crew_sent))
-                crew -= crew_sent
-            except StopIteration:
-                break
+
+        
+    @classmethod
+    def select_islands_once(cls, islands: list[Island] | IslandStore, crew: int) -> list[tuple[Island, int]]:
+        """
+        Select islands to attack without building a navigator, for when it would only be queried once
+        Returns the same as Mode1Navigator(islands, crew).select_islands()
+            - the islands are heapified by ratio in O(n) instead of being fully ordered
+            - only the islands the crew actually reaches are taken out of the heap
+            - ties in ratio are broken by position in islands, as in the tree
+
+        :complexity:
+            Best / worst: O(n + klogn)
+                - n is the number of islands
+                - k is the number of islands the crew reaches
+        """
+        # MaxHeap gives the largest first, so negate the ratio (and index for ties)
+        heap = MaxHeap.heapify([(-cls.island_key(island), -index) for index, island in enumerate(islands)])
+
+        selected_islands = []
+        while crew > 0 and len(heap) > 0:
+            _, index = heap.get_max()
+            island = islands[-index]
+            crew_sent = min(island.marines, crew)
+            selected_islands.append((island, crew_sent))
+            crew -= crew_sent
 
         return selected_islands
 
+    def islands_by_ratio(self, lo: float, hi: float) -> list[Island]:
+        """
+        Return the islands whose ratio of marines to money is in [lo, hi), best ratio first
+        Useful for paging through the islands, e.g. resuming after the last ratio seen
+
+        :complexity:
+            Best / worst: O(logn + k)
+                - n is the number of islands
+                - k is the number of islands returned
+                - the tree seeks to lo in O(logn) and streams successors from there
+        """
+        return [self.to_island(entry) for node in self.island_tree.range(lo, hi)
+                for entry in self.node_entries(node.item)]
 
-        
     def select_islands_from_crew_numbers(self, crew_numbers: list[int]) -> list[float]:
         """
         Calculate the most amount of money you can make with the given crew size
@@ -104,7 +365,24 @@ class Mode1Navigator:
                 Best / worst: O(C * N)
             1054 version:
                 Best / worst: O(N + ClogC)
+            Order-statistic tree version:
+                Best / worst: O(ClogN)
+                    - the subtree totals are kept up to date by update_island, nothing is rebuilt
+            Cached: O(C)
+                - the islands have not changed since the last call with these crew numbers
+                - only batches below NUMPY_BATCH_SIZE (or any size without NumPy) that fit
+                  in the cache are cached
         """
+        # Large batches are not cached: the NumPy engine answers them faster than their key
+            # could be built and the result measured, and a list over the bound would never be stored
+        use_numpy = np is not None and len(crew_numbers) >= self.NUMPY_BATCH_SIZE
+        use_cache = not use_numpy and sys.getsizeof(crew_numbers) <= self.cache.max_bytes
+        if use_cache:
+            cache_key = ('select_islands_from_crew_numbers', self.version, tuple(crew_numbers))
+            try:
+                return list(self.cache.get(cache_key))
+            except KeyError:
+                pass
 
 
         ###################### 1008 version ############################
@@ -120,65 +398,86 @@ class Mode1Navigator:
 
 
 
-        ###################### 1054 version ############################
-        
-        money_made = [0] * len(crew_numbers)
-
-        # Original index, crew number
-        sorted_crew = [(i, crew) for i, crew in enumerate(crew_numbers)]
-        # Sort the crew numbers
-        sorted_crew = mergesort(sorted_crew, key=lambda x: x[1])
-
-        iterator = BSTInOrderIterator(self.island_tree.root) 
-
-        # Variable to keep track of the current island
-        node = next(iterator)
-        island = node.item
-        marines = island.marines
-        money = island.money
-
-        # Iterate through the sorted crew numbers
-        for i, item in enumerate(sorted_crew):
-            # get the original index and crew number
-            og_index, crew = item
-
-            # Use the previous money made so we dont have to recalculate
-            if i>0:
-                money_made[i] = money_made[i-1]
-                crew -= sorted_crew[i-1][1]
-
-            # Iterate through the islands
-            while crew > 0:
-
-                # Here we send marines to the island
-                try:
-                    crew_sent = min(marines, crew)
-                    if crew_sent == 0:
-                        money_made[i] += 0
-                    else:
-                        money_made[i] += money * crew_sent / island.marines
-                        crew -= crew_sent
-                        marines -= crew_sent
-                    
-                    # If there are no more marines, go to the next island
-                    if marines == 0:
-                        node = next(iterator)
-                        island = node.item
-                        marines = island.marines
-                        money = island.money
-                except StopIteration:
-                    break
+        ###################### Order-statistic tree version ############################
 
+        if use_numpy:
+            return self.money_from_crews_numpy(crew_numbers)
+        results = [self.money_from_crew(crew) for crew in crew_numbers]
 
-        
-        og_order_money_made = [0] * len(crew_numbers)
-        # put the money made back into the original order
-            # match the index of each tuple to the original index
-        for i, item in enumerate(sorted_crew):
-            og_index, crew = item
-            og_order_money_made[og_index] = money_made[i]
-        
-        return og_order_money_made
+        if use_cache:
+            self.cache.put(cache_key, results)
+            return list(results)
+        return results
+
+    def money_from_crew(self, crew: int) -> float:
+        """
+        Calculate the money made with the given crew size
+            - the tree keeps the total marines and money of every subtree
+            - a single descent takes whole subtrees the crew can cover, and interpolates
+              the island the crew runs out on
+
+        :complexity:
+            Best / worst: O(logN)
+                - N is the number of islands
+        """
+        return self.island_tree.prefix_by_marines(crew)
+
+    def build_numpy_index(self) -> None:
+        """
+        Copy the islands in ratio order into contiguous NumPy arrays
+            - marines and money per island, and their cumulative sums
+
+        :pre: NumPy is installed
+        :complexity:
+            Best / worst: O(N)
+                - N is the number of islands
+        """
+        entries = [entry for node in BSTMorrisIterator(self.island_tree.root) for entry in self.node_entries(node.item)]
+        if self.store is not None:
+            # gather the columns of the store by index
+            order = np.fromiter(entries, dtype=np.intp, count=len(entries))
+            marines = np.array(self.store.marines, dtype=np.int64)[order]
+            money = np.array(self.store.money, dtype=np.float64)[order]
+        else:
+            marines = np.fromiter((island.marines for island in entries), dtype=np.int64, count=len(entries))
+            money = np.fromiter((island.money for island in entries), dtype=np.float64, count=len(entries))
+
+        prefix_marines = np.zeros(len(marines) + 1, dtype=np.int64)
+        np.cumsum(marines, out=prefix_marines[1:])
+        prefix_money = np.zeros(len(money) + 1, dtype=np.float64)
+        np.cumsum(np.where(marines > 0, money, 0.0), out=prefix_money[1:])
+
+        self.numpy_index = (marines, money, prefix_marines, prefix_money)
+
+    def money_from_crews_numpy(self, crew_numbers: list[int]) -> list[float]:
+        """
+        Vectorised money_from_crew for a whole batch of crew sizes
+            - searchsorted finds the last island each crew can fully plunder
+            - the island the crew runs out on is interpolated for every crew at once
+
+        :pre: NumPy is installed
+        :complexity:
+            Best / worst: O(ClogN) with no Python level loop
+                - plus O(N) to rebuild the arrays after the islands change
+        """
+        if self.numpy_index is None:
+            self.build_numpy_index()
+        marines, money, prefix_marines, prefix_money = self.numpy_index
+
+        crews = np.asarray(crew_numbers, dtype=np.int64)
+        # A negative crew falls before the first prefix, clamp it to no islands like money_from_crew
+        position = np.maximum(np.searchsorted(prefix_marines, crews, side='right') - 1, 0)
+        remaining = crews - prefix_marines[position]
+
+        # Only crews that stop part way through an island interpolate
+            # that island has marines, so the division is safe where it is used
+        partial = (position < len(marines)) & (remaining > 0)
+        island = np.minimum(position, max(len(marines) - 1, 0))
+        result = prefix_money[position]
+        if len(marines) > 0:
+            safe_marines = np.where(marines[island] > 0, marines[island], 1)
+            result = result + np.where(partial, money[island] * remaining / safe_marines, 0.0)
+        return result.tolist()
 
 
 
@@ -194,11 +493,139 @@ class Mode1Navigator:
         :complexity:
             Best / worst: O(logn)
                 - n is the number of islands
-                - occurs when we have to search for the node to update
+                - the old key is found in the reverse index in O(1)
+                - the island leaves its old bucket and joins the bucket for its new key, each O(logn)
+                  (a bucket left empty is deleted)
+                - the subtree totals are updated along both paths
         """
-        
+        island_id = self.island_id(island)
+        old_key = self.island_keys[island_id]
+
+        # The island's weights change, so it leaves its bucket before the island is updated
+        self.remove_from_tree(island_id, island, old_key)
         island.money = new_money
         island.marines = new_marines
+        new_key = self.island_key(island)
+        self.add_to_tree(island_id, island, new_key)
+        self.island_keys[island_id] = new_key
+
+        self.islands_changed()
+
+    def add_islands(self, islands: list[Island] | IslandStore) -> None:
+        """
+        Add new islands to the navigator, without rebuilding it
+
+        :complexity:
+            Best / worst: O(klogn)
+                - k is the number of islands added, n the number of islands
+                - each island joins the bucket for its ratio, and the subtree totals
+                  are updated on the way, so money_from_crew needs no rebuild
+        :raises ValueError: if an island is already in the navigator, or given twice, or the
+            navigator was built from an IslandStore and the island is not in it;
+            nothing is added in that case
+        """
+        islands = list(islands)
+        try:
+            island_ids = [self.island_id(island) for island in islands]
+        except KeyError as error:
+            raise ValueError(error.args[0]) from None
+
+        # Check the whole batch first, so a duplicate leaves the navigator unchanged
+        seen = set()
+        for island, island_id in zip(islands, island_ids):
+            if island_id in seen or island_id in self.island_keys:
+                raise ValueError('Island already in navigator: {0}'.format(island.name))
+            seen.add(island_id)
+
+        for island, island_id in zip(islands, island_ids):
+            key = self.island_key(island)
+            self.add_to_tree(island_id, island, key)
+            self.island_keys[island_id] = key
+
+        self.islands_changed()
+
+    def remove_island(self, island: Island) -> None:
+        """
+        Remove an island from the navigator, without rebuilding it
+
+        :complexity:
+            Best / worst: O(logn)
+                - n is the number of islands
+                - the island's key is found in the reverse index, and it leaves its bucket
+                  as in update_island
+        :raises KeyError: if the island is not in the navigator
+        """
+        island_id = self.island_id(island)
+        key = self.island_keys[island_id]
+        self.remove_from_tree(island_id, island, key)
+        del self.island_keys[island_id]
+
+        self.islands_changed()
+
+    def islands_changed(self) -> None:
+        """
+        Invalidate everything derived from the islands after they change
+            - the NumPy arrays are rebuilt on the next large batch
+            - the version is bumped so cached results are no longer used
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        self.numpy_index = None
+        self.version += 1
+
+    def set_cache_limit(self, max_bytes: int) -> None:
+        """
+        Set the memory bound of the query result cache, in bytes
+            - 0 turns caching off
+            - the hit, miss and eviction counters are self.cache.hits, .misses and .evictions
+
+        :complexity:
+            Best/Worst: O(e)
+                - e is the number of entries evicted to fit the new bound
+        """
+        self.cache.set_max_bytes(max_bytes)
+
+    def add_to_tree(self, island_id: int | tuple[int, int], island: Island, key: float) -> None:
+        """
+        Add the island to the node for key
+            - a new key gets a node holding just the island
+            - a node holding one island is given a bucket for both
+            - otherwise the island goes at the end of the node's bucket
+
+        :complexity:
+            Best/Worst: O(logn)
+        """
+        entry = self.tree_entry(island_id, island)
+        try:
+            node = self.island_tree.get_tree_node_by_key(key)
+        except KeyError:
+            self.island_tree[key] = entry
+            return
+        if not isinstance(node.item, RatioBucket):
+            other = node.item
+            node.item = RatioBucket()
+            node.item.add(self.island_id(self.to_island(other)), other, *self.island_tree.item_weights(other))
+        node.item.add(island_id, entry, *self.island_tree.item_weights(entry))
+        self.island_tree.refresh(key)
+
+    def remove_from_tree(self, island_id: int | tuple[int, int], island: Island, key: float) -> None:
+        """
+        Take the island out of the node for key, before its weights change
+            - a node left empty is deleted
+            - a bucket left with one island is replaced by that island
+
+        :complexity:
+            Best/Worst: O(logn)
+        """
+        node = self.island_tree.get_tree_node_by_key(key)
+        if not isinstance(node.item, RatioBucket):
+            del self.island_tree[key]
+            return
+        node.item.remove(island_id, *self.island_tree.item_weights(self.tree_entry(island_id, island)))
+        if len(node.item) == 1:
+            node.item, = node.item
+        self.island_tree.refresh(key)
 
 
 
@@ -1,5 +1,7 @@
+from array import array
 from island import Island
-from data_structures.heap import MaxHeap
+from island_store import IslandStore
+from data_structures.indexed_heap import IndexedMaxHeap
 
 
 class Mode2Navigator:
@@ -9,10 +11,15 @@ class Mode2Navigator:
     Data Structures:
         - islands: list of islands
             - A list was used as it had O(1) access time to the islands and O(n) time to add islands
+            - Islands added from an IslandStore are kept as the store itself, with their index in the store
+              in store_indices, so no object is created per island and they are scored straight from its columns
             - This allowed for the use of enumeration to keep track of the island index, avoiding the comparision between island objects when the score was the same
                 - (score, index)
+            - Evicted islands leave a None behind, which is dropped when the heap is next rebuilt
+              once they outnumber the islands left, so a rebuild does not rescan every island ever added
         - heap_islands: heap of islands
-            - A MaxHeap was used as it served its main purpose of functioning as a priority queue
+            - An IndexedMaxHeap was used as it served its main purpose of functioning as a priority queue
+            - It is keyed by island index, so a plundered island's score is updated in place instead of being popped and added again
             - This was used to keep track of the islands with the highest score
             - It also made sense as the pirates would plunder the island with the highest score first
             - Using a different data structure would have resulted in a higher time complexity
@@ -27,7 +34,7 @@ class Mode2Navigator:
             - Iterate through the list of islands and add them to the sea
         create_heap_islands:   
             - O(n)  
-                - n is the number of islands
+                - n is the number of islands, plus at most as many evicted ones
             - This is beacuse heapify is O(n) and the iteration is O(n)
                 so the total time complexity is O(n + n) = O(2n) = O(n)
         money_made:
@@ -41,22 +48,33 @@ class Mode2Navigator:
             - Constant operations are used
         update_heap_islands:
             - O(1)
-                - This would occur when no need to rise
+                - This would occur when no need to sink
             - O(logn)
                 - n is the number of islands
-            - This is because add uses the rise function which is O(logn)
+            - This is because update/remove use rise and sink which are O(logn)
         choose_action:
-            - O(logn)
-                - n is the number of islands
-            - This is because get_max is O(logn) due to sink
+            - O(1)
+            - This is because the best island is only peeked at
+        prepare_heap_islands:
+            - O(klogn)
+                - k is the number of islands added since the last day
+            - O(n)
+                - only when the crew changes between days and every score must be recalculated
+        plunder_island:
+            - O(r + logn)
+                - r is the number of pirates that plunder the same island in a row
+            - The heap is updated once per run instead of once per pirate
         simulate_day:
-            - O(n + clogn)
+            - O(klogn + c + slogn)
                 - n is the number of islands
                 - c is the number of pirates
+                - s is the number of times the best island changes
                 - This occurs due to the following reasons:
-                    - creation of sea is O(n)
-                    - for loop is O(c)
-                    - choose_action is O(logn) always due to get_max
+                    - the heap is kept between days, only new islands are added to it
+                    - each pirate costs O(1) while the same island stays the best
+                    - each change of best island updates the heap in O(logn)
+            - O(n + clogn)
+                - when the crew changes and the heap is rebuilt
 
 
     """
@@ -70,23 +88,100 @@ class Mode2Navigator:
         """
         
         self.n_pirates = n_pirates
+        # Each entry is an Island, the IslandStore holding the island, or None once it is evicted
         self.islands = []
+        # Index of each island in its IslandStore (-1 for an Island)
+        self.store_indices = array('q')
+        # Number of None entries in islands
+        self.evicted = 0
         self.heap_islands = None
+        # Crew size the scores in heap_islands were calculated for
+        self.heap_crew = None
+        # Indices of islands added since the heap was last updated
+        self.new_islands = array('q')
 
-    def add_islands(self, islands: list[Island]) -> None:
+    def add_islands(self, islands: list[Island] | IslandStore) -> None:
         """
         Adds the given islands to the sea
+        The islands can also be given as an IslandStore, which is referred to instead of making a view per island
+        They are scored and added to the heap at the start of the next day
 
         :complexity:
             Best/Worst: O(n)
                 - n is the number of islands
         """
+        if isinstance(islands, IslandStore):
+            for store_index in range(len(islands)):
+                self.new_islands.append(len(self.islands))
+                self.islands.append(islands)
+                self.store_indices.append(store_index)
+            return
+
         for island in islands:
+            self.new_islands.append(len(self.islands))
             self.islands.append(island)
+            self.store_indices.append(-1)
+
+    def island_at(self, island_index: int) -> Island | None:
+        """
+        The island at island_index, as a view if it is kept in an IslandStore
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        island = self.islands[island_index]
+        if isinstance(island, IslandStore):
+            return island[self.store_indices[island_index]]
+        return island
+
+    def money_and_marines(self, island_index: int) -> tuple[float, int]:
+        """
+        The money and marines of the island at island_index, read from the store's columns
+        for an island kept in an IslandStore
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        island = self.islands[island_index]
+        if isinstance(island, IslandStore):
+            store_index = self.store_indices[island_index]
+            return island.money[store_index], island.marines[store_index]
+        return island.money, island.marines
+
+    def evict(self, island_index: int) -> None:
+        """
+        Evicts the island at island_index for good, it can never be worth plundering again
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        self.islands[island_index] = None
+        self.evicted += 1
+
+    def compact_islands(self) -> None:
+        """
+        Drops evicted islands, keeping the others in order so ties in score are broken as before
+        Every island index changes, so this must only be done while the heap is rebuilt
 
-    def create_heap_islands(self, islands: list[Island], crew: int) -> None:
+        :complexity:
+            Best/Worst: O(n)
+                - n is the number of islands, evicted ones included
+        """
+        islands = []
+        store_indices = array('q')
+        for island, store_index in zip(self.islands, self.store_indices):
+            if island is not None:
+                islands.append(island)
+                store_indices.append(store_index)
+        self.islands = islands
+        self.store_indices = store_indices
+        self.evicted = 0
+
+    def create_heap_islands(self, islands: list[Island | IslandStore | None], crew: int) -> IndexedMaxHeap:
         """
         Creates a heap of islands based on the score of each island
+        Islands with no money left are evicted, they can never be worth plundering again
+        Islands kept in an IslandStore are scored from its money and marines columns
 
         :complexity:
             Best/Worst: O(n)
@@ -99,13 +194,50 @@ class Mode2Navigator:
 
         new_islands = []
 
+        store_indices = self.store_indices
         for num, island in enumerate(islands):
-            score = self.calculate_score(crew, island)
-            new_islands.append((score, num))
-        
-        # print(new_islands)
+            if island is None:
+                continue
+            if isinstance(island, IslandStore):
+                money, marines = island.money[store_indices[num]], island.marines[store_indices[num]]
+            else:
+                money, marines = island.money, island.marines
+            if money <= 0:
+                self.evict(num)
+                continue
+            new_islands.append((self.score(crew, money, marines), num))
+
+        return IndexedMaxHeap.heapify(new_islands)
+
+    def prepare_heap_islands(self, crew: int) -> None:
+        """
+        Brings the heap up to date for a day with the given crew
+            - the heap is only rebuilt when the crew differs from the last day (every score changes)
+            - otherwise only the newly added islands are scored and added
 
-        return MaxHeap.heapify(new_islands)
+        :complexity:
+            Best case: O(klogn)
+                - k is the number of islands added since the last day
+                - n is the number of islands
+            Worst case: O(n)
+                - the crew changed, or the heap has to grow to fit the new islands
+                - evicted islands are compacted away first if they outnumber the rest
+        """
+        if self.heap_islands is None or crew != self.heap_crew:
+            # The heap is keyed by island index, so islands can only be renumbered while it is rebuilt
+            if 2 * self.evicted > len(self.islands):
+                self.compact_islands()
+            self.heap_islands = self.create_heap_islands(self.islands, crew)
+            self.heap_crew = crew
+        else:
+            self.heap_islands.reserve(len(self.heap_islands) + len(self.new_islands))
+            for island_index in self.new_islands:
+                money, marines = self.money_and_marines(island_index)
+                if money <= 0:
+                    self.evict(island_index)
+                    continue
+                self.heap_islands.add((self.score(crew, money, marines), island_index))
+        self.new_islands = array('q')
 
 
     
@@ -129,9 +261,23 @@ class Mode2Navigator:
         :complexity:
             Best/Worst: O(1)
         """
-        crew_sent = min(island.marines, crew)
+        return self.score(crew, island.money, island.marines)
+
+    @staticmethod
+    def score(crew: int, money: float, marines: int) -> int:
+        """
+        Calculates the score of an island with the given money and marines
+        Same arithmetic as money_made, so scores from store columns match those from islands
+
+        :complexity:
+            Best/Worst: O(1)
+        """
+        crew_sent = min(marines, crew)
         crew_remaining = crew - crew_sent
-        money_made = self.money_made(island, crew_sent)
+        if marines == 0:
+            money_made = money
+        else:
+            money_made = min(money, money * crew_sent / marines)
         score = 2 * crew_remaining + money_made
         return score
     
@@ -151,93 +297,151 @@ class Mode2Navigator:
     def update_heap_islands(self, island_index, crew: int) -> None:
         """
         Updates the sea/heap of islands after plundering
+        The island's score is changed in place, and a fully plundered island is evicted for good
 
         :complexity:
             Best case: O(1)
-                - no need to rise
+                - no need to sink
             Worst case: O(logn)
                 - n is the number of islands
-                - add is O(1)
-                - rise is O(logn)
+                - update and remove are O(logn) due to sink
         """
 
-        if self.islands[island_index].money > 0:
-            updated_score = self.calculate_score(crew, self.islands[island_index])
-            self.heap_islands.add((updated_score, island_index))
+        money, marines = self.money_and_marines(island_index)
+        if money > 0:
+            updated_score = self.score(crew, money, marines)
+            self.heap_islands.update(island_index, updated_score)
+        else:
+            self.heap_islands.remove(island_index)
+            self.evict(island_index)
         
 
 
-    def choose_action(self, crew: int, sea) -> tuple[Island, int]:
+    def choose_action(self, crew: int, sea) -> tuple[int|None, int]:
         """
         Chooses the best action to take
+        When the best island is not worth plundering (None, 0) is returned,
+        as no other island in the sea can score any better
 
         :complexity:
-            Best/Worst: O(log n)
-                - n is the number of islands
-                - get_max is O(log n) due to sink
-                - calculate_score is O(1)
-                - add is O(1)
+            Best/Worst: O(1)
+                - peek is O(1), the island stays in the heap
         """
 
         if_skip = 2 * crew
-        score, island_index = sea.get_max()
-        crew_sent = min(self.islands[island_index].marines, crew)
+        score, island_index = sea.peek()
 
         if score <= if_skip:
-            action = (None, 0)
-        else:
-            action = (island_index, crew_sent)
+            return (None, 0)
 
-        return action
+        crew_sent = min(self.money_and_marines(island_index)[1], crew)
+        return (island_index, crew_sent)
         
 
  
 
+    def plunder_island(self, island_index: int, crew: int, results: list[tuple[Island|None, int]]) -> None:
+        """
+        Sends pirates to the best island until another island would be chosen instead
+            - the island stays the best while its new score beats the runner-up in the heap
+              and is still worth more than skipping
+            - the heap is only updated once, when the run ends
+
+        While the island has at least crew marines every pirate sends the full crew,
+        so the money made by one pirate is also the next pirate's score. That stretch is
+        replayed with the same arithmetic as update_island and calculate_score, so the
+        results and the island's money match plundering it pirate by pirate.
+
+        :complexity:
+            Best/Worst: O(r + logn)
+                - r is the number of pirates sent in this run
+                - n is the number of islands
+        """
+        island = self.island_at(island_index)
+        if_skip = 2 * crew
+        # (score, index) of the next best island, the run ends once the island drops below it
+        runner_up = self.heap_islands.peek_second()
+        runner_score, runner_index = runner_up if runner_up is not None else (if_skip, island_index)
+
+        while len(results) < self.n_pirates:
+            if 0 < crew <= island.marines:
+                money, marines = island.money, island.marines
+                limit = self.n_pirates - len(results)
+                sent = 0
+                while True:
+                    money -= min(money, money * crew / marines)
+                    marines -= crew
+                    sent += 1
+                    if sent == limit or money <= 0 or marines < crew:
+                        break
+                    score = min(money, money * crew / marines)
+                    if score <= if_skip or score < runner_score or (score == runner_score and island_index < runner_index):
+                        break
+                island.money, island.marines = money, marines
+                results.extend([(island, crew)] * sent)
+            else:
+                crew_sent = min(island.marines, crew)
+                results.append((island, crew_sent))
+                self.update_island(island, crew_sent)
+
+            if island.money <= 0 or island.marines == 0:
+                break
+            score = self.calculate_score(crew, island)
+            if score <= if_skip or score < runner_score or (score == runner_score and island_index < runner_index):
+                break
+
+        # Update the island's score in the heap
+        self.update_heap_islands(island_index, crew)
+
     def simulate_day(self, crew: int) -> list[tuple[Island|None, int]]:
         """
         Simulates a day of plundering
+        The heap is kept between days, so only islands plundered today or newly added are rescored
+        Consecutive pirates plundering the same island are handled by plunder_island without touching the heap
 
         :complexity:
-            Best/Worst: O(n + clogn)
+            Best: O(klogn + c + slogn)
                 - n is the number of islands
                 - c is the number of pirates
-                - This occurs due to the following reasons:
-                    - creation of sea is O(n)
-                    - for loop is O(c)
-                    - choose_action is O(logn) always due to get_max
+                - k is the number of islands added since the last day
+                - s is the number of times the best island changes
+            Worst: O(n + clogn)
+                - occurs when the crew differs from the last day and every island is rescored,
+                  and the best island changes after every pirate
         """
         
-        # Create heap using new_islands list
-        # O(n)
-        self.heap_islands = self.create_heap_islands(self.islands, crew)
-
+        self.prepare_heap_islands(crew)
 
         results = []
+        # Islands taken out today but not plundered, they are put back at the end of the day
+        deferred = []
 
-        # O(c)
-        for i in range(self.n_pirates):
+        while len(results) < self.n_pirates:
 
-            
+            if len(self.heap_islands) == 0:
+                # Nothing is added back until the end of the day
+                results.extend([(None, 0)] * (self.n_pirates - len(results)))
+                break
 
-            if len(self.heap_islands) > 0: 
+            island_index, crew_sent = self.choose_action(crew, self.heap_islands)
 
-                island_index, crew_sent = self.choose_action(crew, self.heap_islands)
-                
-                if crew_sent == 0:
-                    results.append((None, 0))
-                    continue
+            if island_index is None:
+                # No island left is worth it, so the remaining pirates all skip
+                results.extend([(None, 0)] * (self.n_pirates - len(results)))
+                break
 
-                results.append((self.islands[island_index], crew_sent))
+            if crew_sent == 0:
+                self.heap_islands.remove(island_index)
+                deferred.append(island_index)
+                results.append((None, 0))
+                continue
 
-                # Update island
-                self.update_island(self.islands[island_index], crew_sent)
+            self.plunder_island(island_index, crew, results)
 
-                # Add island back to heap
-                self.update_heap_islands(island_index, crew)
+        for island_index in deferred:
+            score = self.score(crew, *self.money_and_marines(island_index))
+            self.heap_islands.add((score, island_index))
 
-            else:
-                results.append((None, 0))            
-        
         return results
 
 
@@ -0,0 +1,81 @@
+from io import StringIO
+from unittest import TestCase
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen
+
+from data_structures.array_bst import ArrayBinarySearchTree
+from data_structures.bst import BinarySearchTree
+
+
+class ArrayBinarySearchTreeTests(TestCase):
+
+    @number("7.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_insert_and_get(self):
+        tree = ArrayBinarySearchTree()
+        for key in [50, 30, 70, 20, 40, 60, 80]:
+            tree[key] = str(key)
+        self.assertEqual(len(tree), 7)
+        self.assertEqual(tree[40], '40')
+        self.assertIn(60, tree)
+        self.assertNotIn(65, tree)
+        self.assertRaises(KeyError, tree.__getitem__, 65)
+        self.assertRaises(ValueError, tree.__setitem__, 30, 'again')
+        self.assertListEqual(list(tree), [20, 30, 40, 50, 60, 70, 80])
+        self.assertListEqual(list(tree.items_in_order())[:2], [(20, '20'), (30, '30')])
+
+    @number("7.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_delete(self):
+        tree = ArrayBinarySearchTree()
+        for key in [50, 30, 70, 20, 40, 60, 80, 65]:
+            tree[key] = key
+        del tree[20]  # leaf
+        del tree[60]  # one child
+        del tree[50]  # two children, at the root
+        self.assertListEqual(list(tree), [30, 40, 65, 70, 80])
+        self.assertEqual(tree[65], 65)
+        self.assertRaises(ValueError, tree.__delitem__, 50)
+        for key in [30, 40, 65, 70, 80]:
+            del tree[key]
+        self.assertTrue(tree.is_empty())
+        self.assertEqual(len(tree), 0)
+
+    @number("7.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_free_list_reuse(self):
+        tree = ArrayBinarySearchTree(8)
+        for key in range(8):
+            tree[key] = key
+        self.assertEqual(tree.capacity, 8)
+        for key in [1, 3, 5]:
+            del tree[key]
+        # Released slots are reused before the columns grow
+        for key in [10, 11, 12]:
+            tree[key] = key
+        self.assertEqual(tree.capacity, 8)
+        self.assertEqual(tree.free, tree.NIL)
+        self.assertListEqual(list(tree), [0, 2, 4, 6, 7, 10, 11, 12])
+
+    @number("7.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_growth_matches_bst(self):
+        RandomGen.set_seed(7)
+        keys = list(range(500))
+        RandomGen.random_shuffle(keys)
+        tree = ArrayBinarySearchTree()
+        bst = BinarySearchTree()
+        for key in keys:
+            tree[key] = -key
+            bst[key] = -key
+        self.assertGreaterEqual(tree.capacity, 500)
+        self.assertEqual(str(tree), str(bst))
+        for key in keys[::3]:
+            del tree[key]
+            del bst[key]
+        self.assertEqual(str(tree), str(bst))
+        self.assertListEqual(list(tree.items_in_order()), [(node.key, node.item) for node in bst])
+        drawn, expected = StringIO(), StringIO()
+        tree.draw(to=drawn)
+        bst.draw(to=expected)
+        self.assertEqual(drawn.getvalue(), expected.getvalue())
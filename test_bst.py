@@ -0,0 +1,136 @@
+from unittest import TestCase
+from ed_utils.timeout import timeout
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen
+
+from data_structures.bst import BinarySearchTree, BSTInOrderIterator, BSTMorrisIterator, BSTPreOrderIterator
+from data_structures.avl import AVLTree
+
+
+class BSTMorrisIteratorTests(TestCase):
+
+    def shape(self, nodes):
+        """
+        Every node with the keys of its children. The nodes are listed before the
+        traversal, so a thread left behind fails the comparison instead of looping.
+        """
+        return [(node.key,
+                 node.left.key if node.left is not None else None,
+                 node.right.key if node.right is not None else None)
+                for node in nodes]
+
+    def random_trees(self):
+        RandomGen.set_seed(14)
+        keys = list(range(60))
+        RandomGen.random_shuffle(keys)
+        for tree in [BinarySearchTree(), AVLTree()]:
+            for key in keys:
+                tree[key] = str(key)
+            yield tree
+
+    @number("5.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_full_traversal(self):
+        for tree in self.random_trees():
+            nodes = list(BSTPreOrderIterator(tree.root))
+            shape = self.shape(nodes)
+            self.assertListEqual([node.key for node in BSTMorrisIterator(tree.root)], list(range(60)))
+            self.assertListEqual(self.shape(nodes), shape)
+
+    @number("5.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_early_stop_restores_tree(self):
+        for tree in self.random_trees():
+            nodes = list(BSTPreOrderIterator(tree.root))
+            shape = self.shape(nodes)
+            for k in [0, 1, 2, 5, 17, 30, 59, 60]:
+                with BSTMorrisIterator(tree.root) as iterator:
+                    taken = [next(iterator).key for _ in range(k)]
+                self.assertListEqual(taken, list(range(k)))
+                self.assertListEqual(self.shape(nodes), shape)
+                self.assertListEqual([node.key for node in BSTInOrderIterator(tree.root)], list(range(60)))
+                for key in range(60):
+                    self.assertEqual(tree.get_tree_node_by_key(key).item, str(key))
+
+    @number("5.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_close_without_with(self):
+        for tree in self.random_trees():
+            nodes = list(BSTPreOrderIterator(tree.root))
+            shape = self.shape(nodes)
+            iterator = BSTMorrisIterator(tree.root)
+            for _ in range(23):
+                next(iterator)
+            iterator.close()
+            iterator.close()
+            self.assertListEqual(self.shape(nodes), shape)
+
+
+class BSTSearchTests(TestCase):
+
+    # Even keys only, so every odd number falls in a gap between two keys
+    KEYS = list(range(0, 120, 2))
+
+    def random_trees(self):
+        RandomGen.set_seed(15)
+        keys = list(self.KEYS)
+        RandomGen.random_shuffle(keys)
+        for tree in [BinarySearchTree(), AVLTree()]:
+            for key in keys:
+                tree[key] = str(key)
+            yield tree
+
+    @number("5.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_floor(self):
+        for tree in self.random_trees():
+            # Exact hits
+            for key in self.KEYS:
+                self.assertEqual(tree.floor(key).key, key)
+            # Gaps, and above the maximum
+            for key in range(1, 130, 2):
+                self.assertEqual(tree.floor(key).key, min(key - 1, self.KEYS[-1]))
+            self.assertEqual(tree.floor(10 ** 6).item, str(self.KEYS[-1]))
+            # Below the minimum
+            for key in [-1, -50]:
+                self.assertRaises(KeyError, tree.floor, key)
+        self.assertRaises(KeyError, BinarySearchTree().floor, 0)
+        self.assertRaises(KeyError, AVLTree().floor, 0)
+
+    @number("5.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_ceiling(self):
+        for tree in self.random_trees():
+            # Exact hits
+            for key in self.KEYS:
+                self.assertEqual(tree.ceiling(key).key, key)
+            # Gaps, and below the minimum
+            for key in range(-9, 119, 2):
+                self.assertEqual(tree.ceiling(key).key, max(key + 1, self.KEYS[0]))
+            self.assertEqual(tree.ceiling(-10 ** 6).item, str(self.KEYS[0]))
+            # Above the maximum
+            for key in [119, 200]:
+                self.assertRaises(KeyError, tree.ceiling, key)
+        self.assertRaises(KeyError, BinarySearchTree().ceiling, 0)
+        self.assertRaises(KeyError, AVLTree().ceiling, 0)
+
+    @number("5.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_iter_from(self):
+        for tree in self.random_trees():
+            for key in range(-3, 124):
+                expected = [k for k in self.KEYS if k >= key]
+                self.assertListEqual([node.key for node in tree.iter_from(key)], expected)
+            # Stopping early and resuming from the last key seen
+            iterator = tree.iter_from(31)
+            self.assertListEqual([next(iterator).key for _ in range(3)], [32, 34, 36])
+            self.assertListEqual([node.key for node in tree.iter_from(37)][:2], [38, 40])
+            self.assertListEqual([node.key for node in tree.range(31, 37)], [32, 34, 36])
+        self.assertListEqual(list(BinarySearchTree().iter_from(0)), [])
+        self.assertListEqual(list(AVLTree().iter_from(0)), [])
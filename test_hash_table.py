@@ -0,0 +1,126 @@
+from unittest import TestCase
+from ed_utils.timeout import timeout
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen
+
+from data_structures.hash_table import LinearProbeTable, FullError
+
+
+class LinearProbeTableTests(TestCase):
+
+    MODES = [{}, {'cache_hashes': True}, {'robin_hood': True}]
+
+    @number("8.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_delete_from_full_table(self):
+        for mode in self.MODES:
+            table = LinearProbeTable([5], **mode)
+            for i, key in enumerate('abcde'):
+                table[key] = i
+            self.assertTrue(table.is_full())
+            self.assertRaises(FullError, table.__setitem__, 'f', 5)
+
+            del table['c']
+            self.assertEqual(len(table), 4)
+            self.assertNotIn('c', table)
+            for i, key in enumerate('abde'):
+                self.assertEqual(table[key], 'abcde'.index(key))
+            table['f'] = 5
+            for key in 'abdef':
+                del table[key]
+            self.assertTrue(table.is_empty())
+
+    def churn(self, table, key_count, steps, seed):
+        """ Random sets, deletes and lookups on table and a dict, checking they always agree. """
+        RandomGen.set_seed(seed)
+        expected = {}
+        for step in range(steps):
+            key = 'island {0}'.format(RandomGen.randint(0, key_count - 1))
+            action = RandomGen.randint(0, 9)
+            if action < 5:
+                if key not in expected and len(expected) == table.table_size:
+                    self.assertRaises(FullError, table.__setitem__, key, step)
+                    continue
+                table[key] = step
+                expected[key] = step
+            elif action < 8:
+                if key in expected:
+                    del table[key]
+                    del expected[key]
+                else:
+                    self.assertRaises(KeyError, table.__delitem__, key)
+            else:
+                self.assertEqual(key in table, key in expected)
+                if key in expected:
+                    self.assertEqual(table[key], expected[key])
+            self.assertEqual(len(table), len(expected))
+
+        # Iteration follows insertion order, like a dict
+        self.assertListEqual(table.keys(), list(expected.keys()))
+        self.assertListEqual(table.values(), list(expected.values()))
+        self.assertEqual(str(table), ''.join('({0},{1})\n'.format(k, v) for k, v in expected.items()))
+        for key, value in expected.items():
+            self.assertEqual(table[key], value)
+
+    @number("8.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_churn_matches_dict(self):
+        for mode in self.MODES:
+            for seed in range(5):
+                self.churn(LinearProbeTable(**mode), 200, 3000, seed)
+
+    @number("8.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_churn_full_table(self):
+        # The table cannot grow past 13 slots, so it is often full
+        for mode in self.MODES:
+            for seed in range(5):
+                self.churn(LinearProbeTable([5, 13], **mode), 20, 2000, seed)
+
+    @number("8.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_shrink_and_compact(self):
+        for mode in self.MODES:
+            table = LinearProbeTable(**mode)
+            for i in range(1000):
+                table[str(i)] = i
+            grown = table.table_size
+            for i in range(990):
+                del table[str(i)]
+                # Holes never outnumber the entries (plus the one just deleted)
+                self.assertLessEqual(len(table.entry_keys), 2 * len(table) + 1)
+            self.assertLess(table.table_size, grown)
+            self.assertGreaterEqual(table.table_size * table.max_load, len(table))
+            self.assertListEqual(table.keys(), [str(i) for i in range(990, 1000)])
+            self.assertListEqual(table.values(), list(range(990, 1000)))
+
+    @number("8.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_from_items_presized(self):
+        for mode in self.MODES:
+            resizes = []
+
+            class CountingTable(LinearProbeTable):
+                def _resize(self, size_index):
+                    resizes.append(size_index)
+                    LinearProbeTable._resize(self, size_index)
+
+            pairs = [(str(i), i) for i in range(5000)] + [('7', 'last')]
+            table = CountingTable.from_items(pairs, **mode)
+            self.assertEqual(len(resizes), 1)
+            self.assertEqual(table.size_index, table.size_index_for(len(pairs)))
+            self.assertEqual(len(table), 5000)
+            self.assertEqual(table['7'], 'last')
+            self.assertEqual(table.keys()[:3], ['0', '1', '2'])
+
+            # update resizes at most once, and not at all when the new pairs fit
+            resizes.clear()
+            table.update([(str(i), -i) for i in range(5000, 20000)])
+            self.assertEqual(len(resizes), 1)
+            resizes.clear()
+            table.update([('0', 0), ('1', 1)])
+            self.assertEqual(resizes, [])
+            self.assertEqual(len(table), 20000)
+            self.assertEqual(table['19999'], -19999)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from ed_utils.decorators import number, visibility
+
+from data_structures.heap import MaxHeap
+
+
+class MaxHeapTests(TestCase):
+
+    @number("3.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_add_past_max_size_grows(self):
+        heap = MaxHeap(2)
+        self.assertEqual(heap.capacity, 2)
+        for i in range(10):
+            heap.add(i)
+        self.assertEqual(len(heap), 10)
+        self.assertGreaterEqual(heap.capacity, 10)
+        # Capacity doubles, so 2 -> 4 -> 8 -> 16
+        self.assertEqual(heap.capacity, 16)
+        self.assertListEqual([heap.get_max() for _ in range(10)], list(range(9, -1, -1)))
+
+    @number("3.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_get_max_shrinks(self):
+        heap = MaxHeap(64)
+        for i in range(64):
+            heap.add(i)
+        for _ in range(60):
+            heap.get_max()
+        self.assertEqual(len(heap), 4)
+        # Halves each time the heap falls below a quarter of its capacity
+        self.assertLess(heap.capacity, 64)
+        self.assertGreaterEqual(heap.capacity, len(heap))
+        self.assertListEqual([heap.get_max() for _ in range(4)], [3, 2, 1, 0])
+        self.assertLessEqual(heap.capacity, 2)
+        self.assertRaises(IndexError, heap.get_max)
+        # Freed slots are cleared, so the heap keeps no references to removed elements
+        self.assertTrue(all(heap.the_array[k] is None for k in range(len(heap.the_array))))
+
+    @number("3.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_reserve(self):
+        heap = MaxHeap.heapify([3, 1, 2])
+        array = heap.the_array
+        heap.reserve(2)
+        self.assertIs(heap.the_array, array)
+        heap.reserve(100)
+        self.assertEqual(heap.capacity, 100)
+        array = heap.the_array
+        for i in range(97):
+            heap.add(i)
+        # No reallocation while the reserved room lasts
+        self.assertIs(heap.the_array, array)
+        self.assertEqual(len(heap), 100)
+        self.assertEqual(heap.get_max(), 96)
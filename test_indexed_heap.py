@@ -0,0 +1,107 @@
+from unittest import TestCase
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen
+
+from data_structures.indexed_heap import IndexedMaxHeap
+
+
+class IndexedMaxHeapTests(TestCase):
+
+    def check_heap(self, heap, expected):
+        """ The heap holds exactly expected (handle -> priority), in heap order, with correct positions. """
+        self.assertEqual(len(heap), len(expected))
+        self.assertEqual(len(heap.positions), len(expected))
+        for k in range(1, len(heap) + 1):
+            priority, handle = heap.the_array[k]
+            self.assertEqual(heap.positions[handle], k)
+            self.assertEqual(expected[handle], priority)
+            if k > 1:
+                self.assertLessEqual(heap.the_array[k], heap.the_array[k // 2])
+
+    @number("4.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_update_and_remove(self):
+        heap = IndexedMaxHeap.heapify([(5, 'a'), (3, 'b'), (8, 'c'), (1, 'd'), (7, 'e')])
+        expected = {'a': 5, 'b': 3, 'c': 8, 'd': 1, 'e': 7}
+        self.check_heap(heap, expected)
+        self.assertEqual(heap.peek(), (8, 'c'))
+        self.assertEqual(heap.peek_second(), (7, 'e'))
+
+        heap.update('d', 10)  # rises to the top
+        heap.update('c', 0)   # sinks
+        expected.update(d=10, c=0)
+        self.check_heap(heap, expected)
+        self.assertEqual(heap.peek(), (10, 'd'))
+        self.assertEqual(heap.peek_second(), (7, 'e'))
+
+        # Removing the last slot needs no fill
+        last_handle = heap.the_array[len(heap)][1]
+        self.assertEqual(heap.remove(last_handle), expected.pop(last_handle))
+        self.check_heap(heap, expected)
+        self.assertEqual(heap.remove('d'), 10)
+        del expected['d']
+        self.check_heap(heap, expected)
+        self.assertRaises(KeyError, heap.remove, 'd')
+        self.assertRaises(KeyError, heap.update, 'd', 1)
+        self.assertNotIn('d', heap)
+
+        self.assertEqual(heap.get_max(), (7, 'e'))
+        del expected['e']
+        self.check_heap(heap, expected)
+
+    @number("4.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_remove_fill_rises(self):
+        # The last element fills the hole and must rise, because the hole is in another branch
+        heap = IndexedMaxHeap.heapify([(100, 0), (50, 1), (90, 2), (10, 3), (9, 4), (80, 5), (70, 6)])
+        heap.remove(3)
+        self.check_heap(heap, {0: 100, 1: 50, 2: 90, 4: 9, 5: 80, 6: 70})
+        self.assertEqual(heap.positions[6], 2)
+
+    @number("4.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_peek_empty_and_single(self):
+        heap = IndexedMaxHeap(1)
+        self.assertRaises(IndexError, heap.peek)
+        self.assertRaises(IndexError, heap.get_max)
+        self.assertIsNone(heap.peek_second())
+        heap.add((1, 'a'))
+        self.assertEqual(heap.peek(), (1, 'a'))
+        self.assertIsNone(heap.peek_second())
+
+    @number("4.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_duplicate_handles(self):
+        heap = IndexedMaxHeap(2)
+        heap.add((1, 'a'))
+        self.assertRaises(ValueError, heap.add, (2, 'a'))
+        self.check_heap(heap, {'a': 1})
+        self.assertRaises(ValueError, IndexedMaxHeap.heapify, [(1, 'a'), (2, 'b'), (3, 'a')])
+
+    @number("4.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_random_operations(self):
+        RandomGen.set_seed(8)
+        heap = IndexedMaxHeap(1)
+        expected = {}
+        for step in range(2000):
+            handle = RandomGen.randint(0, 49)
+            action = RandomGen.randint(0, 3)
+            if handle not in expected:
+                priority = RandomGen.randint(0, 100)
+                heap.add((priority, handle))
+                expected[handle] = priority
+            elif action == 0:
+                self.assertEqual(heap.remove(handle), expected.pop(handle))
+            elif action == 1:
+                expected[handle] = RandomGen.randint(0, 100)
+                heap.update(handle, expected[handle])
+            elif action == 2:
+                priority, top = heap.get_max()
+                self.assertEqual((priority, top), max((p, h) for h, p in expected.items()))
+                del expected[top]
+            if expected:
+                ordered = sorted(((p, h) for h, p in expected.items()), reverse=True)
+                self.assertEqual(heap.peek(), ordered[0])
+                self.assertEqual(heap.peek_second(), ordered[1] if len(ordered) > 1 else None)
+            self.check_heap(heap, expected)
@@ -4,7 +4,8 @@ from ed_utils.decorators import number, visibility
 from random_gen import RandomGen
 
 from island import Island
-from mode1 import Mode1Navigator
+from island_store import IslandStore
+from mode1 import Mode1Navigator, np
 
 class Mode1Tests(TestCase):
 
@@ -110,3 +111,149 @@ class Mode1Tests(TestCase):
         nav = Mode1Navigator(self.islands, 200)
         results = nav.select_islands_from_crew_numbers([0, 200, 500, 300, 40])
         self.assertListEqual(results, [0, 865, 1450, 1160, 240])
+
+    @number("1.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_sorted_input(self):
+        # Islands arriving already ordered by ratio must not degrade the tree.
+        islands = [Island(str(i), 1000, i + 1) for i in range(5000)]
+        nav = Mode1Navigator(islands, 3)
+        self.assertLessEqual(nav.island_tree.root.height, 20)
+        selected = nav.select_islands()
+        self.check_solution(islands, 3, selected, 2000)
+
+    @number("1.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_update_reorders(self):
+        self.load_basic()
+        nav = Mode1Navigator(self.islands, 200)
+        # Island B goes from the worst ratio to the best.
+        nav.update_island(self.islands[1], 300, 1)
+        self.islands[1].marines = 1
+        selected = nav.select_islands()
+        self.assertEqual(selected[0][0].name, "B")
+        self.check_solution(self.islands, 200, selected, 1162)
+
+    @number("1.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_large_crew_batch(self):
+        # Large batches may take the NumPy path, which must agree with the pure Python one.
+        self.load_basic()
+        nav = Mode1Navigator(self.islands, 200)
+        crew_numbers = [(i * 7) % 600 for i in range(2 * Mode1Navigator.NUMPY_BATCH_SIZE)] + [-1, -50]
+        results = nav.select_islands_from_crew_numbers(crew_numbers)
+        for crew, money in zip(crew_numbers, results):
+            self.assertAlmostEqual(money, nav.money_from_crew(crew))
+        self.assertAlmostEqual(results[crew_numbers.index(200)], 865)
+        self.assertListEqual(results[-2:], [0, 0])
+
+    @number("1.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_island_store(self):
+        self.load_basic()
+        store = IslandStore(self.islands)
+        nav = Mode1Navigator(store, 200)
+        self.check_solution(self.islands, 200, nav.select_islands(), 865)
+        nav.update_island(store[1], 300, 1)
+        self.islands[1].marines = 1
+        self.check_solution(self.islands, 200, nav.select_islands(), 1162)
+
+        # Queries hand out views of the store, islands are added and removed as views too
+        self.assertListEqual(nav.islands_by_ratio(0, 1), [store[1], store[2], store[0], store[3], store[4]])
+        store.append("F", 100, 1)
+        nav.add_islands([store[5]])
+        nav.remove_island(store[0])
+        self.assertListEqual(nav.islands_by_ratio(0, 1), [store[1], store[5], store[2], store[3], store[4]])
+        self.assertRaises(ValueError, nav.add_islands, [IslandStore(self.islands)[0]])
+        self.assertRaises(ValueError, nav.add_islands, [Island("G", 100, 1)])
+        self.assertRaises(KeyError, nav.remove_island, self.islands[0])
+
+    @number("1.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_islands_by_ratio(self):
+        self.load_basic()
+        nav = Mode1Navigator(self.islands, 200)
+        # Ratios: C 0.05, A 0.25, D ~0.257, E ~0.333, B 0.5
+        self.assertListEqual([island.name for island in nav.islands_by_ratio(0, 0.3)], ["C", "A", "D"])
+        self.assertListEqual([island.name for island in nav.islands_by_ratio(0.25, 1)], ["A", "D", "E", "B"])
+        self.assertListEqual(nav.islands_by_ratio(0.6, 1), [])
+
+    @number("1.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_select_islands_once(self):
+        self.load_basic()
+        for crew in [0, 40, 200, 500]:
+            nav = Mode1Navigator(self.islands, crew)
+            self.assertListEqual(Mode1Navigator.select_islands_once(self.islands, crew), nav.select_islands())
+
+    @number("1.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_duplicate_ratios(self):
+        islands = [
+            Island("A", 200, 50), Island("B", 400, 100), Island("C", 100, 0),
+            Island("D", 0, 10), Island("E", 300, 0), Island("F", 100, 25),
+        ]
+        nav = Mode1Navigator(islands, 120)
+        # A, B and F share a ratio and keep their order, islands without money come last
+        self.assertListEqual([island.name for island in nav.islands_by_ratio(0, float('inf'))], ["C", "E", "A", "B", "F"])
+        self.assertListEqual([(island.name, sent) for island, sent in nav.select_islands()], [("C", 0), ("E", 0), ("A", 50), ("B", 70)])
+        self.assertListEqual(nav.select_islands_from_crew_numbers([0, 100, 175, 200]), [0, 400, 700, 700])
+
+        nav.update_island(islands[1], 400, 0)
+        self.assertListEqual([island.name for island in nav.islands_by_ratio(0, 1)], ["C", "E", "B", "A", "F"])
+        self.assertListEqual(nav.select_islands_from_crew_numbers([75, 100]), [300, 300])
+
+    @number("1.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_query_cache(self):
+        self.load_basic()
+        nav = Mode1Navigator(self.islands, 200)
+        first = nav.select_islands()
+        first.clear()
+        self.check_solution(self.islands, 200, nav.select_islands(), 865)
+        self.assertListEqual(nav.select_islands_from_crew_numbers([0, 200]), [0, 865])
+        self.assertListEqual(nav.select_islands_from_crew_numbers([0, 200]), [0, 865])
+        self.assertEqual((nav.cache.hits, nav.cache.misses), (2, 2))
+
+        # Updates must not be answered from the cache
+        nav.update_island(self.islands[1], 300, 1)
+        self.assertListEqual(nav.select_islands_from_crew_numbers([0, 200]), [0, 1162])
+
+        nav.set_cache_limit(0)
+        self.assertEqual(len(nav.cache), 0)
+        self.assertGreaterEqual(nav.cache.evictions, 3)
+        self.assertListEqual(nav.select_islands_from_crew_numbers([0, 200]), [0, 1162])
+        self.assertEqual(len(nav.cache), 0)
+
+        # A batch for the NumPy engine is neither looked up nor stored
+        nav.set_cache_limit(Mode1Navigator.CACHE_MAX_BYTES)
+        misses = nav.cache.misses
+        crews = [200] * Mode1Navigator.NUMPY_BATCH_SIZE
+        self.assertListEqual(nav.select_islands_from_crew_numbers(crews), [1162] * len(crews))
+        self.assertEqual(len(nav.cache), 0 if np is not None else 1)
+        self.assertEqual(nav.cache.misses, misses if np is not None else misses + 1)
+
+    @number("1.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_add_remove_islands(self):
+        self.load_basic()
+        nav = Mode1Navigator(self.islands[:2], 200)
+        self.assertListEqual(nav.select_islands_from_crew_numbers([200]), [600])
+        nav.add_islands(self.islands[2:])
+        self.check_solution(self.islands, 200, nav.select_islands(), 865)
+        self.assertListEqual(nav.select_islands_from_crew_numbers([200]), [865])
+        self.assertRaises(ValueError, nav.add_islands, [self.islands[0]])
+
+        # A batch with a duplicate adds nothing, and cached results stay correct
+        nav2 = Mode1Navigator(self.islands[:1], 200)
+        self.assertListEqual(nav2.select_islands_from_crew_numbers([200]), [400])
+        self.assertRaises(ValueError, nav2.add_islands, [self.islands[2], self.islands[0]])
+        self.assertRaises(ValueError, nav2.add_islands, [self.islands[2], self.islands[2]])
+        self.assertListEqual(nav2.islands_by_ratio(0, 1), [self.islands[0]])
+        self.assertListEqual(nav2.select_islands_from_crew_numbers([200]), [400])
+        self.assertEqual(nav2.money_from_crew(200), 400)
+
+        # Removing C (the best ratio) leaves A, D and E, and 10 marines of B
+        nav.remove_island(self.islands[2])
+        self.assertListEqual(nav.select_islands_from_crew_numbers([300]), [1070])
+        self.assertRaises(KeyError, nav.remove_island, self.islands[2])
@@ -4,6 +4,7 @@ from ed_utils.decorators import number, visibility
 from random_gen import RandomGen
 
 from island import Island
+from island_store import IslandStore
 from mode2 import Mode2Navigator
 
 class Mode2Tests(TestCase):
@@ -121,3 +122,65 @@ class Mode2Tests(TestCase):
             # Score
             score = 2 * (100 - sent_crew) + received
             self.assertEqual(score, expected)
+
+    @number("2.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_plundered_islands_evicted(self):
+        self.load_basic()
+        nav = Mode2Navigator(3)
+        nav.add_islands(self.islands)
+        nav.simulate_day(100)
+        # A, D and E were fully plundered on the first day.
+        self.assertEqual(len(nav.heap_islands), 2)
+        results = nav.simulate_day(100)
+        # C is plundered, B is not worth more than keeping the crew (score 200).
+        self.assertEqual((results[0][0].name, results[0][1]), ("C", 5))
+        self.assertListEqual(results[1:], [(None, 0), (None, 0)])
+        self.assertEqual(len(nav.heap_islands), 1)
+
+    @number("2.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_many_pirates_same_island(self):
+        a = Island("A", 1000, 100)
+        b = Island("B", 300, 100)
+        nav = Mode2Navigator(25)
+        nav.add_islands([a, b])
+        results = nav.simulate_day(10)
+        # Every pirate makes 100 from A until it is empty, then 30 from B.
+        self.assertListEqual([(island.name, sent) for island, sent in results[:10]], [("A", 10)] * 10)
+        self.assertListEqual([(island.name, sent) for island, sent in results[10:20]], [("B", 10)] * 10)
+        self.assertListEqual(results[20:], [(None, 0)] * 5)
+        self.assertEqual((a.money, a.marines), (0, 0))
+
+    @number("2.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_island_store(self):
+        self.load_basic()
+        store = IslandStore(self.islands)
+        nav = Mode2Navigator(3)
+        nav.add_islands(store)
+        results = nav.simulate_day(100)
+        self.assertListEqual([(island.name, sent) for island, sent in results], [("A", 100), ("D", 90), ("E", 100)])
+        # Views are made on demand, views of the same island are equal.
+        self.assertEqual(results[0][0], store[0])
+        self.assertIsNot(store[0], store[0])
+        # Plundering writes through to the store's columns.
+        self.assertEqual(store.money[0], 0)
+        self.assertEqual(store.marines[3], 0)
+
+    @number("2.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_evicted_islands_compacted(self):
+        self.load_basic()
+        nav = Mode2Navigator(4)
+        nav.add_islands(self.islands)
+        results = nav.simulate_day(100)
+        self.assertListEqual([(island.name, sent) for island, sent in results], [("A", 100), ("D", 90), ("E", 100), ("C", 5)])
+
+        # A new crew rebuilds the heap, dropping the four plundered islands
+        nav.add_islands([Island("F", 500, 10)])
+        results = nav.simulate_day(10)
+        self.assertListEqual([(island.name if island is not None else None, sent) for island, sent in results],
+                             [("F", 10), (None, 0), (None, 0), (None, 0)])
+        self.assertEqual(len(nav.islands), 2)
+        self.assertIs(nav.islands[0], self.b)
@@ -0,0 +1,82 @@
+from unittest import TestCase
+from ed_utils.decorators import number, visibility
+from random_gen import RandomGen
+
+from island import Island
+from data_structures.order_statistic_tree import OrderStatisticTree
+
+
+class OrderStatisticTreeTests(TestCase):
+
+    def brute_prefix(self, items, crew):
+        """ Plunder the items in key order, the last one partially. """
+        money = 0
+        for item in items:
+            if crew <= 0:
+                break
+            sent = min(item.marines, crew)
+            if sent > 0:
+                money += item.money * sent / item.marines
+            crew -= sent
+        return money
+
+    def check_tree(self, tree, expected):
+        keys = sorted(expected)
+        items = [expected[key] for key in keys]
+        self.assertEqual(len(tree), len(keys))
+        for k, key in enumerate(keys):
+            self.assertEqual(tree.select(k).key, key)
+            self.assertEqual(tree.rank(key), k)
+            # Keys between the stored ones
+            self.assertEqual(tree.rank(key + 0.5), k + 1)
+        self.assertEqual(tree.rank(-1), 0)
+        self.assertRaises(IndexError, tree.select, len(keys))
+        self.assertRaises(IndexError, tree.select, -1)
+        for crew in [0, 1, 7, 50, 123, 500, 2000, 10**6]:
+            self.assertAlmostEqual(tree.prefix_by_marines(crew), self.brute_prefix(items, crew))
+
+    @number("6.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_basic(self):
+        tree = OrderStatisticTree()
+        islands = {1: Island("C", 100, 5), 2: Island("A", 400, 100), 3: Island("B", 300, 150)}
+        for key, island in islands.items():
+            tree[key] = island
+        self.assertEqual(tree.select(0).item.name, "C")
+        self.assertEqual(tree.rank(3), 2)
+        self.assertEqual(tree.prefix_by_marines(105), 500)
+        self.assertEqual(tree.prefix_by_marines(180), 650)
+        self.check_tree(tree, islands)
+
+    @number("6.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_against_brute_force(self):
+        RandomGen.set_seed(16)
+        tree = OrderStatisticTree()
+        expected = {}
+        for step in range(600):
+            key = RandomGen.randint(0, 99)
+            action = RandomGen.randint(0, 2)
+            if key not in expected:
+                expected[key] = Island(str(key), RandomGen.randint(0, 500), RandomGen.randint(0, 60))
+                tree[key] = expected[key]
+            elif action == 0:
+                del tree[key]
+                del expected[key]
+            else:
+                # Change the item in place, then refresh the totals on its path
+                expected[key].money = RandomGen.randint(0, 500)
+                expected[key].marines = RandomGen.randint(0, 60)
+                tree.refresh(key)
+            if step % 25 == 0:
+                self.check_tree(tree, expected)
+        self.check_tree(tree, expected)
+        self.assertRaises(KeyError, tree.refresh, 1000)
+
+    @number("6.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    def test_from_items(self):
+        islands = {key: Island(str(key), 10 * key, key % 7) for key in range(200)}
+        tree = OrderStatisticTree.from_items(list(islands.items()))
+        self.check_tree(tree, islands)
+        self.assertEqual(tree.root.size, 200)